@@ -3,9 +3,10 @@ import streamlit as st
 import logging
 import random
 
-from retriever.factory import create_retriever
-from chain import GeminiLLM, build_qa_chain_with_rerank, run_qa_chain
-from config import TOP_K
+from config import DEFAULT_CORPUS, TOP_K, USE_FAQ
+
+# retriever/chain 모듈은 무거운 의존성(torch, sentence_transformers, pinecone 등)을 끌어오므로
+# 페이지가 먼저 렌더링되도록 실제 사용 시점(load_components, 질문 처리)에 import
 
 # 로그 설정
 logging.basicConfig(level=logging.INFO)
@@ -16,13 +17,19 @@ if "history" not in st.session_state:
     st.session_state.history = []
 
 @st.cache_resource
-def load_components():
+def load_components(corpus: str = DEFAULT_CORPUS):
     """
-    Retriever와 Gemini 기반 LLM 인스턴스를 로드
-    - 캐싱을 통해 반복 로딩 방지
+    코퍼스별 Retriever, FAQ 매처와 Gemini 기반 LLM 인스턴스를 로드
+    - 코퍼스마다 한 번만 캐싱 (SBERT / Cross-Encoder 모델은 model_runtime 풀에서 코퍼스 간 공유)
     - 환경 변수로부터 Gemini API 키 확인
     """
-    retriever = create_retriever()
+    from retriever.factory import create_retriever
+    from retriever.faq_retriever import create_faq_matcher
+    from chain import GeminiLLM
+    from corpus import get_corpus
+
+    retriever = create_retriever(corpus)
+    faq_matcher = create_faq_matcher(get_corpus(corpus)["faq_index_path"]) if USE_FAQ else None
 
     gemini_api_key = os.getenv("GEMINI_API_KEY")
     if not gemini_api_key:
@@ -30,7 +37,7 @@ def load_components():
         st.stop()
 
     llm = GeminiLLM(api_key=gemini_api_key)
-    return retriever, llm
+    return retriever, llm, faq_matcher
 
 def main():
     """
@@ -216,11 +223,26 @@ def main():
     query = st.text_input("", placeholder="질문을 입력하세요...", key="query_input", label_visibility="collapsed")
     st.markdown('</div>', unsafe_allow_html=True)
 
+    # URL 쿼리 파라미터로 코퍼스 선택 (예: ?corpus=cohort-22)
+    query_params = st.experimental_get_query_params()
+    corpus = query_params.get("corpus", [DEFAULT_CORPUS])[0]
+    # ?profile=1 이면 이 세션의 요청마다 단계별 시간 / CPU 프로파일을 저장 (없으면 환경 변수 BOAZ_PROFILE로 결정)
+    # 공개 앱 방문자가 켜지 못하도록 운영자가 BOAZ_PROFILE_ALLOW_URL=1로 허용한 경우에만 적용
+    from profiling import url_profiling_allowed
+
+    profile = True if query_params.get("profile", ["0"])[0] == "1" and url_profiling_allowed() else None
+
     if st.button("💬 질문하기"):
         if not query:
             st.warning("🤔 먼저 질문을 입력해주세요.")
         else:
-            retriever, llm = load_components()
+            from chain import build_qa_chain_with_rerank, run_qa_chain
+
+            try:
+                retriever, llm, faq_matcher = load_components(corpus)
+            except ValueError as e:
+                st.error(str(e))
+                st.stop()
 
             # 랜덤하게 이름 선택
             names = ["재영이가", "예린이가", "완철이가", "관우가"]
@@ -228,8 +250,10 @@ def main():
 
             with st.spinner(f"🤖 {selected_name} 열심히 생각하고 있어요..."):
                 # QA 체인 생성 및 실행
-                qa_chain = build_qa_chain_with_rerank(llm, retriever, top_k=3)
-                result = run_qa_chain(qa_chain, query)
+                qa_chain = build_qa_chain_with_rerank(
+                    llm, retriever, top_k=3, faq_matcher=faq_matcher, corpus=corpus
+                )
+                result = run_qa_chain(qa_chain, query, profile=profile)
 
                 answer = result.get("result", "[결과 없음]")
                 reranked_docs = result.get("source_documents", [])
@@ -237,6 +261,13 @@ def main():
                 # 히스토리에 저장
                 st.session_state.history.append((query, answer, reranked_docs))
 
+            if "profile" in result:
+                report = result["profile"]
+                st.caption(
+                    f"🔬 프로파일 {'저장됨' if report['output_dir'] else '저장 실패 (로그 참고)'} — 전체 {report['wall_ms']:.0f}ms "
+                    f"(연산 {report['compute_ms']:.0f}ms / 네트워크 대기 {report['network_ms']:.0f}ms)"
+                )
+
     # 이전 질문/답변 히스토리 출력
     if st.session_state.history:
         st.markdown('<div class="history-header">📚 대화 기록</div>', unsafe_allow_html=True)
@@ -0,0 +1,71 @@
+import sys
+import os
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+import argparse
+import time
+from typing import Dict, List
+
+from config import DEFAULT_CORPUS
+from corpus import get_corpus
+from preprocess import load_documents
+from retriever.korean_tokenizer import create_bm25_encoder
+from benchmarks.eval_set import build_faq_eval_set, load_evidence_eval_set, recall_at_k
+
+# sparse 벡터 1개 항목 크기 (uint32 인덱스 + float32 값)
+BYTES_PER_SPARSE_ENTRY = 8
+
+
+def _sparse_dot(query_vec: Dict[str, List], doc_vec: Dict[str, List]) -> float:
+    doc_weights = dict(zip(doc_vec["indices"], doc_vec["values"]))
+    return sum(v * doc_weights.get(i, 0.0) for i, v in zip(query_vec["indices"], query_vec["values"]))
+
+
+def main():
+    parser = argparse.ArgumentParser(description="BM25 토크나이저별 어휘 크기 / 인덱스 크기 / recall@k 비교")
+    parser.add_argument("--tokenizers", nargs="+", default=["default", "char_ngram", "kiwi"])
+    parser.add_argument("--corpus", default=DEFAULT_CORPUS)
+    parser.add_argument("--eval-file", help='JSONL 평가 파일 ({"query": ..., "evidence": ...}), 없으면 CSV FAQ 사용')
+    parser.add_argument("--k", nargs="+", type=int, default=[3, 5, 10, 20])
+    args = parser.parse_args()
+
+    data_path = get_corpus(args.corpus)["data_path"]
+    docs = load_documents(data_path)
+    texts = [doc.page_content for doc in docs]
+    if args.eval_file:
+        eval_set = load_evidence_eval_set(args.eval_file, docs)
+    else:
+        # FAQ 질문은 정답 청크에 그대로 들어 있어 어떤 토크나이저든 recall이 1에 가까움 (조사 / 바꿔 말하기 효과 측정 불가)
+        eval_set = build_faq_eval_set(docs, data_path)
+        print("⚠️ --eval-file 없이 CSV FAQ 질문으로 평가합니다. 질의가 정답 청크에 그대로 포함되어 토크나이저 간 차이가 드러나지 않습니다.")
+    print(f"📊 문서 {len(texts)}개, 평가 질의 {len(eval_set)}개")
+    if not eval_set:
+        print("❌ 평가 질의가 없습니다.")
+        return
+
+    for name in args.tokenizers:
+        t0 = time.perf_counter()
+        encoder = create_bm25_encoder(texts, tokenizer_name=name)
+        doc_vecs = encoder.encode_documents(texts)
+        ingest_s = time.perf_counter() - t0
+
+        vocab_size = len(encoder.doc_freq)
+        nnz = sum(len(vec["indices"]) for vec in doc_vecs)
+        index_kb = nnz * BYTES_PER_SPARSE_ENTRY / 1024
+
+        rankings = []
+        for query, _ in eval_set:
+            q_vec = encoder.encode_queries([query])[0]
+            scores = [_sparse_dot(q_vec, d_vec) for d_vec in doc_vecs]
+            rankings.append(sorted(range(len(scores)), key=lambda i: scores[i], reverse=True))
+        relevant_sets = [relevant for _, relevant in eval_set]
+        recalls = " ".join(f"R@{k}={recall_at_k(rankings, relevant_sets, k):.3f}" for k in args.k)
+
+        print(
+            f"🔤 [{name}] vocab={vocab_size} nnz={nnz} index≈{index_kb:.1f}KB "
+            f"fit+encode={ingest_s:.2f}s | {recalls}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,71 @@
+import sys
+import os
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+import argparse
+import time
+
+import numpy as np
+
+from config import DEFAULT_CORPUS
+from corpus import get_corpus
+from chunking import CHUNKERS, get_chunker
+from model_runtime import get_query_encoder
+from preprocess import load_documents
+from benchmarks.eval_set import build_faq_eval_set, load_evidence_eval_set, recall_at_k
+
+# dense 벡터 1개 원소 크기 (float32)
+BYTES_PER_DIM = 4
+
+
+def main():
+    parser = argparse.ArgumentParser(description="청킹 전략별 인덱스 크기 / 적재 시간 / 검색 recall 비교")
+    parser.add_argument("--strategies", nargs="+", default=list(CHUNKERS))
+    parser.add_argument("--corpus", default=DEFAULT_CORPUS)
+    parser.add_argument("--eval-file", help='JSONL 평가 파일 ({"query": ..., "evidence": ...}), 없으면 CSV FAQ 사용')
+    parser.add_argument("--k", nargs="+", type=int, default=[3, 5, 10, 20])
+    args = parser.parse_args()
+
+    data_path = get_corpus(args.corpus)["data_path"]
+    encoder = get_query_encoder()
+
+    for name in args.strategies:
+        # 1. 청킹 (로딩 + 분할)
+        t0 = time.perf_counter()
+        docs = load_documents(data_path, chunker=get_chunker(name))
+        chunk_s = time.perf_counter() - t0
+        texts = [doc.page_content for doc in docs]
+        if not texts:
+            print(f"❌ [{name}] 청크가 없습니다.")
+            continue
+
+        # 2. 임베딩 (업로드 시 dense 인코딩 비용)
+        t0 = time.perf_counter()
+        doc_vecs = encoder.encode(texts, normalize=True)
+        embed_s = time.perf_counter() - t0
+
+        total_chars = sum(len(t) for t in texts)
+        text_kb = sum(len(t.encode("utf-8")) for t in texts) / 1024
+        vector_kb = doc_vecs.size * BYTES_PER_DIM / 1024
+
+        # 3. 검색 recall (dense 코사인 기준)
+        if args.eval_file:
+            eval_set = load_evidence_eval_set(args.eval_file, docs)
+        else:
+            eval_set = build_faq_eval_set(docs, data_path)
+        recalls = "평가 질의 없음"
+        if eval_set:
+            q_vecs = encoder.encode([q for q, _ in eval_set], normalize=True)
+            rankings = np.argsort(-(q_vecs @ doc_vecs.T), axis=1).tolist()
+            relevant_sets = [relevant for _, relevant in eval_set]
+            recalls = " ".join(f"R@{k}={recall_at_k(rankings, relevant_sets, k):.3f}" for k in args.k)
+
+        print(
+            f"✂️ [{name}] chunks={len(texts)} avg_len={total_chars / len(texts):.0f} "
+            f"text≈{text_kb:.1f}KB vectors≈{vector_kb:.1f}KB | "
+            f"chunk={chunk_s:.2f}s embed={embed_s:.2f}s | {recalls} (질의 {len(eval_set)}개)"
+        )
+
+
+if __name__ == "__main__":
+    main()
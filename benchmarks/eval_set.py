@@ -0,0 +1,64 @@
+import sys
+import os
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+import json
+import re
+from typing import Dict, List, Sequence, Set, Tuple
+
+from langchain.schema import Document
+
+from config import DATA_PATH
+from preprocess import load_faq_pairs
+
+
+def build_faq_eval_set(docs: List[Document], data_path: str = DATA_PATH) -> List[Tuple[str, Set[int]]]:
+    """
+    CSV FAQ 질문을 질의로, 같은 (source, row_index)에서 나온 청크를 정답으로 하는 평가셋 생성
+    - 반환: [(질의, 정답 문서 인덱스 집합), ...] (정답 청크가 없는 질문은 제외)
+    """
+    row_to_doc_ids: Dict[Tuple[str, int], Set[int]] = {}
+    for i, doc in enumerate(docs):
+        key = (doc.metadata.get("source"), doc.metadata.get("row_index"))
+        if key[1] is not None:
+            row_to_doc_ids.setdefault(key, set()).add(i)
+
+    eval_set = []
+    for pair in load_faq_pairs(data_path):
+        relevant = row_to_doc_ids.get((pair["source"], pair["row_index"]))
+        if relevant:
+            eval_set.append((pair["question"], relevant))
+    return eval_set
+
+
+def _normalize(text: str) -> str:
+    return re.sub(r"\s+", " ", text).strip()
+
+
+def load_evidence_eval_set(path: str, docs: List[Document]) -> List[Tuple[str, Set[int]]]:
+    """
+    JSONL 평가 파일({"query": ..., "evidence": ...})로 청킹 방식과 무관한 평가셋 생성
+    - evidence(원문 속 짧은 근거 구절)를 포함하는 청크를 정답으로 간주 (공백 정규화 후 비교)
+    """
+    normalized_docs = [_normalize(doc.page_content) for doc in docs]
+    eval_set = []
+    with open(path, "r", encoding="utf-8") as f:
+        for line in f:
+            if not line.strip():
+                continue
+            item = json.loads(line)
+            evidence = _normalize(item["evidence"])
+            relevant = {i for i, text in enumerate(normalized_docs) if evidence in text}
+            if relevant:
+                eval_set.append((item["query"], relevant))
+    return eval_set
+
+
+def recall_at_k(rankings: Sequence[Sequence[int]], relevant_sets: Sequence[Set[int]], k: int) -> float:
+    """
+    질의별 상위 k개 안에 정답 문서가 하나라도 포함된 비율
+    """
+    if not rankings:
+        return 0.0
+    hits = sum(1 for ranked, relevant in zip(rankings, relevant_sets) if relevant & set(ranked[:k]))
+    return hits / len(rankings)
@@ -0,0 +1,97 @@
+import sys
+import os
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+import argparse
+import time
+from typing import List, Tuple
+
+import numpy as np
+from langchain.schema import Document
+
+from config import DEFAULT_CORPUS, GROUNDING_THRESHOLDS
+from corpus import get_corpus
+from chain import check_grounding
+from export_models import SAMPLE_DOCS
+from preprocess import load_faq_pairs
+
+# FAQ CSV가 없을 때 SAMPLE_DOCS에 대한 근거 없는 답변 예시
+UNSUPPORTED_CLAIMS = [
+    "BOAZ는 매달 해외 연수 프로그램을 무료로 지원하고 있습니다.",
+    "지원자는 반드시 정보처리기사 자격증을 제출해야 합니다.",
+    "면접은 온라인 코딩 테스트 한 번으로 대체됩니다.",
+    "활동 기간은 3개월이며 수료 후 인턴십이 보장됩니다.",
+    "정기 세션은 평일 오전 9시에 진행됩니다.",
+    "회비는 한 학기에 50만 원입니다.",
+]
+
+# (답변, 참조 문서, 근거 여부)
+Case = Tuple[str, List[Document], bool]
+
+
+def build_cases(data_path: str, n_context: int = 3) -> List[Case]:
+    """
+    근거 있는 답변 / 근거 없는 답변 평가 케이스 생성
+    - FAQ가 있으면: 정답 FAQ + 다른 FAQ를 참조 문서로 두고, 자기 답변(근거 있음)과 다른 FAQ의 답변(근거 없음)을 검증
+    - 없으면: SAMPLE_DOCS 문장(근거 있음)과 UNSUPPORTED_CLAIMS(근거 없음)를 사용
+    """
+    pairs = load_faq_pairs(data_path)
+    use_faq = len(pairs) >= 2 * n_context
+    if use_faq:
+        texts = [f"{p['question']}\n{p['answer']}" for p in pairs]
+        answers = [p["answer"] for p in pairs]
+    else:
+        texts, answers = list(SAMPLE_DOCS), list(SAMPLE_DOCS)
+
+    cases: List[Case] = []
+    n = len(texts)
+    for i in range(n):
+        # 참조 문서: i번째부터 n_context개 (i번째 답변은 근거 있음)
+        context = [Document(page_content=texts[(i + k) % n]) for k in range(n_context)]
+        cases.append((answers[i], context, True))
+        # 참조 문서에 포함되지 않은 다른 FAQ의 답변 (FAQ가 없으면 지어낸 주장)
+        negative = answers[(i + n_context) % n] if use_faq else UNSUPPORTED_CLAIMS[i % len(UNSUPPORTED_CLAIMS)]
+        cases.append((negative, context, False))
+    return cases
+
+
+def main():
+    parser = argparse.ArgumentParser(description="답변 근거 검증 방식별 지연시간 / 근거 판별 정확도 벤치마크")
+    parser.add_argument("--scorers", nargs="+", default=list(GROUNDING_THRESHOLDS))
+    parser.add_argument("--corpus", default=DEFAULT_CORPUS)
+    parser.add_argument("--max-cases", type=int, default=200)
+    args = parser.parse_args()
+
+    cases = build_cases(get_corpus(args.corpus)["data_path"])[:args.max_cases]
+    print(f"📊 평가 케이스 {len(cases)}개 (근거 있음 {sum(c[2] for c in cases)}개)")
+
+    for scorer in args.scorers:
+        threshold = GROUNDING_THRESHOLDS[scorer]
+        # 워밍업 (모델 로딩은 측정에서 제외)
+        check_grounding(cases[0][0], cases[0][1], mode="flag", scorer=scorer)
+
+        latencies, n_sentences = [], []
+        pos_scores, neg_scores = [], []
+        for answer, docs, grounded in cases:
+            t0 = time.perf_counter()
+            _, grounding = check_grounding(answer, docs, mode="flag", scorer=scorer)
+            latencies.append((time.perf_counter() - t0) * 1000)
+            n_sentences.append(len(grounding["sentences"]))
+            scores = [item["score"] for item in grounding["sentences"]]
+            (pos_scores if grounded else neg_scores).extend(scores)
+
+        pos, neg = np.asarray(pos_scores), np.asarray(neg_scores)
+        kept = float((pos >= threshold).mean()) if len(pos) else float("nan")
+        flagged = float((neg < threshold).mean()) if len(neg) else float("nan")
+        print(
+            f"🧾 [{scorer}] threshold={threshold:g} | "
+            f"latency p50={np.percentile(latencies, 50):.1f}ms p95={np.percentile(latencies, 95):.1f}ms "
+            f"max={max(latencies):.1f}ms (평균 {np.mean(n_sentences):.1f}문장) | "
+            f"근거 문장 통과율={kept:.3f} 무근거 문장 탐지율={flagged:.3f} | "
+            f"점수 중앙값 근거={np.median(pos) if len(pos) else float('nan'):.3f} "
+            f"무근거={np.median(neg) if len(neg) else float('nan'):.3f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,87 @@
+import sys
+import os
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+import argparse
+import time
+from typing import Callable, Dict, Optional
+
+import numpy as np
+
+from model_runtime import BACKENDS, CrossEncoderScorer, QueryEncoder
+from export_models import load_sample_texts
+
+
+def _time_call(fn: Callable[[], object], repeats: int, warmup: int = 2) -> Dict[str, float]:
+    """
+    워밍업 후 repeats회 실행하여 지연시간(ms) 통계 반환
+    """
+    for _ in range(warmup):
+        fn()
+    samples = []
+    for _ in range(repeats):
+        t0 = time.perf_counter()
+        fn()
+        samples.append((time.perf_counter() - t0) * 1000)
+    return {"p50_ms": float(np.percentile(samples, 50)), "p95_ms": float(np.percentile(samples, 95))}
+
+
+def _default_torch_threads() -> Optional[int]:
+    """
+    torch 기본 스레드 수 (torch가 없으면 None)
+    - torch.set_num_threads는 프로세스 전역이므로 threads=0 단계 전에 이 값으로 되돌려야 함
+    """
+    try:
+        import torch
+    except ImportError:
+        return None
+    return torch.get_num_threads()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="reranker / 쿼리 인코더 CPU 추론 백엔드별 지연시간 벤치마크")
+    parser.add_argument("--backends", nargs="+", default=list(BACKENDS))
+    parser.add_argument("--threads", nargs="+", type=int, default=[0], help="비교할 스레드 수 (0 = 기본값)")
+    parser.add_argument("--repeats", type=int, default=20)
+    args = parser.parse_args()
+
+    queries, docs = load_sample_texts()
+    query = queries[0]
+    print(f"📊 샘플: rerank 문서 {len(docs)}개, 질의 '{query}'")
+
+    default_threads = _default_torch_threads()
+    baseline: Dict[int, Dict[str, float]] = {}
+    for num_threads in args.threads:
+        if num_threads == 0 and default_threads is not None:
+            # 앞선 단계에서 바뀐 전역 스레드 수를 기본값으로 복원 (_set_torch_threads(0)은 아무것도 하지 않음)
+            import torch
+
+            torch.set_num_threads(default_threads)
+        for backend in args.backends:
+            try:
+                encoder = QueryEncoder(backend=backend, num_threads=num_threads)
+                scorer = CrossEncoderScorer(backend=backend, num_threads=num_threads)
+            except (FileNotFoundError, ImportError) as e:
+                print(f"[WARN] {backend} 건너뜀: {e}")
+                continue
+
+            encode_stats = _time_call(lambda: encoder.encode([query]), args.repeats)
+            rerank_stats = _time_call(lambda: scorer.score(query, docs), args.repeats)
+
+            if backend == "torch":
+                baseline[num_threads] = {"encode": encode_stats["p50_ms"], "rerank": rerank_stats["p50_ms"]}
+            ref = baseline.get(num_threads)
+            speedup = (
+                f" | speedup encode x{ref['encode'] / encode_stats['p50_ms']:.2f}"
+                f" rerank x{ref['rerank'] / rerank_stats['p50_ms']:.2f}"
+                if ref else ""
+            )
+            print(
+                f"⏱️ [{backend}, threads={num_threads or 'default'}] "
+                f"encode p50={encode_stats['p50_ms']:.1f}ms p95={encode_stats['p95_ms']:.1f}ms | "
+                f"rerank p50={rerank_stats['p50_ms']:.1f}ms p95={rerank_stats['p95_ms']:.1f}ms{speedup}"
+            )
+
+
+if __name__ == "__main__":
+    main()
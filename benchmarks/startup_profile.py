@@ -0,0 +1,158 @@
+import sys
+import os
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+import argparse
+import json
+import subprocess
+import time
+from collections import defaultdict
+from typing import Any, Dict, List, Optional
+from dotenv import load_dotenv
+
+# .env 파일에서 API 키 로드 (첫 응답 측정 여부 판단용)
+load_dotenv()
+
+ROOT_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+
+# import 시간을 측정할 모듈 (앱 시작 경로 순서)
+PROFILED_MODULES = ["config", "chain", "retriever.factory", "retriever.faq_retriever", "app"]
+
+# 첫 페이지 렌더링 시간 측정용 스크립트 (새 프로세스에서 실행)
+FIRST_PAGE_SNIPPET = """
+import time
+t0 = time.perf_counter()
+from streamlit.testing.v1 import AppTest
+at = AppTest.from_file("app.py", default_timeout=120)
+at.run()
+print(time.perf_counter() - t0)
+"""
+
+# 첫 응답 시간 측정용 스크립트 (모델/인덱스 로딩 + 질의 1회)
+FIRST_ANSWER_SNIPPET = """
+import os, time
+t0 = time.perf_counter()
+from retriever.factory import create_retriever
+from chain import GeminiLLM, build_qa_chain_with_rerank, run_qa_chain
+retriever = create_retriever()
+llm = GeminiLLM(api_key=os.environ["GEMINI_API_KEY"])
+chain = build_qa_chain_with_rerank(llm, retriever, top_k=3)
+run_qa_chain(chain, {query!r})
+print(time.perf_counter() - t0)
+"""
+
+
+def _run_python(args: List[str]) -> subprocess.CompletedProcess:
+    """
+    프로젝트 루트에서 새 파이썬 프로세스를 실행 (콜드 스타트 측정을 위해 매번 새 프로세스 사용)
+    """
+    return subprocess.run(
+        [sys.executable, *args],
+        cwd=ROOT_DIR,
+        capture_output=True,
+        text=True,
+    )
+
+
+def profile_imports(module: str, top_n: int = 10) -> Dict[str, Any]:
+    """
+    `python -X importtime`으로 모듈 import 시간을 측정하고 최상위 패키지별로 집계
+    """
+    proc = _run_python(["-X", "importtime", "-c", f"import {module}"])
+    if proc.returncode != 0:
+        return {"module": module, "error": proc.stderr.strip().splitlines()[-1:]}
+
+    # 형식: "import time: self [us] | cumulative | imported package"
+    by_package: Dict[str, int] = defaultdict(int)
+    total_us = 0
+    for line in proc.stderr.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        self_part, _, name = line[len("import time:"):].split("|", 2)
+        self_us = int(self_part)
+        top_package = name.strip().split(".")[0]
+        by_package[top_package] += self_us
+        total_us += self_us
+
+    top = sorted(by_package.items(), key=lambda x: x[1], reverse=True)[:top_n]
+    return {
+        "module": module,
+        "total_ms": round(total_us / 1000, 1),
+        "top_packages_ms": {name: round(us / 1000, 1) for name, us in top},
+    }
+
+
+def measure_first_page() -> Optional[float]:
+    """
+    Streamlit AppTest로 app.py를 한 번 실행하여 첫 페이지 렌더링까지의 시간(초) 측정
+    """
+    t0 = time.perf_counter()
+    proc = _run_python(["-c", FIRST_PAGE_SNIPPET])
+    if proc.returncode != 0:
+        print(f"[WARN] 첫 페이지 측정 실패: {proc.stderr.strip().splitlines()[-1:]}")
+        return None
+    return round(time.perf_counter() - t0, 3)
+
+
+def measure_first_answer(query: str) -> Optional[float]:
+    """
+    새 프로세스에서 retriever/LLM을 로드하고 질의 1회를 처리하기까지의 시간(초) 측정
+    - Pinecone/Gemini API 키가 없으면 건너뜀
+    """
+    if not os.getenv("PINECONE_API_KEY") or not os.getenv("GEMINI_API_KEY"):
+        print("[WARN] API 키가 없어 첫 응답 시간 측정을 건너뜁니다.")
+        return None
+
+    t0 = time.perf_counter()
+    proc = _run_python(["-c", FIRST_ANSWER_SNIPPET.format(query=query)])
+    if proc.returncode != 0:
+        print(f"[WARN] 첫 응답 측정 실패: {proc.stderr.strip().splitlines()[-1:]}")
+        return None
+    return round(time.perf_counter() - t0, 3)
+
+
+def _fmt_seconds(value: Optional[float]) -> str:
+    return "측정 안 됨" if value is None else f"{value}s"
+
+
+def main():
+    parser = argparse.ArgumentParser(description="앱/리트리버 콜드 스타트 프로파일")
+    parser.add_argument("--query", default="보아즈는 뭐하는 곳이야?", help="첫 응답 측정에 사용할 질의")
+    parser.add_argument("--output", help="결과를 저장할 JSON 경로")
+    parser.add_argument("--baseline", help="비교할 이전 결과 JSON 경로")
+    parser.add_argument("--skip-answer", action="store_true", help="첫 응답 시간 측정 생략")
+    args = parser.parse_args()
+
+    results: Dict[str, Any] = {
+        "imports": [profile_imports(module) for module in PROFILED_MODULES],
+        "first_page_s": measure_first_page(),
+        "first_answer_s": None if args.skip_answer else measure_first_answer(args.query),
+    }
+
+    for item in results["imports"]:
+        if "error" in item:
+            print(f"❌ import {item['module']}: {item['error']}")
+            continue
+        top = ", ".join(f"{name}={ms}ms" for name, ms in list(item["top_packages_ms"].items())[:5])
+        print(f"📦 import {item['module']}: {item['total_ms']}ms ({top})")
+    print(f"🖥️ 첫 페이지 렌더링: {_fmt_seconds(results['first_page_s'])}")
+    print(f"💬 첫 응답: {_fmt_seconds(results['first_answer_s'])}")
+
+    # 이전 결과와 비교 (회귀 추적)
+    if args.baseline and os.path.exists(args.baseline):
+        with open(args.baseline, "r", encoding="utf-8") as f:
+            baseline = json.load(f)
+        for key in ("first_page_s", "first_answer_s"):
+            old, new = baseline.get(key), results.get(key)
+            if old and new:
+                print(f"↔️ {key}: {old}s → {new}s ({(new - old) / old * 100:+.1f}%)")
+
+    if args.output:
+        os.makedirs(os.path.dirname(os.path.abspath(args.output)), exist_ok=True)
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(results, f, ensure_ascii=False, indent=2)
+        print(f"✅ 결과 저장: {args.output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,13 +1,27 @@
 import os
+import re
+import time
 import logging
-from typing import Any, Mapping, Optional, List
+from typing import Any, Dict, Mapping, Optional, List, Tuple
 
-import google.generativeai as genai
-from google.api_core.exceptions import ResourceExhausted
 from langchain.llms.base import LLM
 from langchain.prompts import PromptTemplate
 from langchain.schema import Document
 
+from config import (
+    DEFAULT_CORPUS,
+    FAQ_ANSWER_TEMPLATE,
+    GROUNDING_MAX_PASSAGES,
+    GROUNDING_MAX_SENTENCES,
+    GROUNDING_MODE,
+    GROUNDING_SCORER,
+    GROUNDING_THRESHOLDS,
+    RECENCY_BOOST,
+    RECENCY_BOOST_YEARS,
+)
+from metrics import corpus_metrics
+from profiling import profile_request, profiling_enabled, stage
+
 # 로그 설정
 logger = logging.getLogger(__name__)
 logger.setLevel(logging.INFO)
@@ -16,9 +30,12 @@ logger.setLevel(logging.INFO)
 class GeminiLLM(LLM):
     """
     Google Gemini API를 LangChain LLM 인터페이스로 감싼 커스텀 클래스
+    - client: google.generativeai와 같은 configure / GenerativeModel 인터페이스를 가진 객체
+      (지정하지 않으면 google.generativeai 사용, 부하 테스트 시 loadtest.fakes.FakeGenAI 주입)
     """
 
     model_name: str = "gemini-2.0-flash"
+    client: Any = None
 
     def __init__(self, api_key: str, model_name: Optional[str] = None, **kwargs):
         super().__init__(**kwargs)
@@ -29,17 +46,26 @@ class GeminiLLM(LLM):
         if model_name:
             self.model_name = model_name
 
-        # Gemini API 구성
-        genai.configure(api_key=api_key)
+        # Gemini API 구성 (google.generativeai는 무거우므로 LLM 생성 시점에 import)
+        self._genai().configure(api_key=api_key)
+
+    def _genai(self):
+        if self.client is not None:
+            return self.client
+        import google.generativeai as genai
+        return genai
 
     def _call(self, prompt: str, stop: Optional[List[str]] = None) -> str:
         """
         LangChain 내부에서 호출되는 메서드
         프롬프트를 받아 Gemini API로 응답을 생성
         """
+        from google.api_core.exceptions import ResourceExhausted
+
         try:
-            model = genai.GenerativeModel(self.model_name)
-            response = model.generate_content(prompt)
+            model = self._genai().GenerativeModel(self.model_name)
+            with stage("gemini.generate_content", kind="network"):
+                response = model.generate_content(prompt)
             if hasattr(response, 'text') and response.text:
                 return response.text
             else:
@@ -62,24 +88,28 @@ class GeminiLLM(LLM):
 
 
 # Cross-Encoder 기반 문서 재정렬
-from transformers import AutoTokenizer, AutoModelForSequenceClassification
-import torch
-
-def cross_encoder_rerank(query: str, docs: List[Any], top_k: int = 3) -> List[Any]:
+def cross_encoder_rerank(
+    query: str,
+    docs: List[Any],
+    top_k: int = 3,
+    recency_boost: float = RECENCY_BOOST
+) -> List[Any]:
     """
     Cross-Encoder 모델로 문서 relevance 점수 계산 후 재정렬
+    - 모델은 최초 호출 시 한 번만 로드되며, config.INFERENCE_BACKEND에 따라
+      fp32 PyTorch / int8 양자화 / ONNX Runtime 중 하나로 실행됨
+    - recency_boost > 0이면 메타데이터 year 기준 최신 문서에 가산점을 더함 (오래된 문서는 제외하지 않고 순위만 낮춤)
     """
-    model_name = "cross-encoder/ms-marco-MiniLM-L-6-v2"
-    tokenizer = AutoTokenizer.from_pretrained(model_name)
-    model = AutoModelForSequenceClassification.from_pretrained(model_name)
-
-    pairs = [(query, doc.page_content) for doc in docs]
-    inputs = tokenizer.batch_encode_plus(pairs, return_tensors="pt", truncation=True, padding=True)
+    from model_runtime import get_cross_encoder
+    from retriever.filters import recency_weights
 
-    with torch.no_grad():
-        logits = model(**inputs).logits.squeeze()
+    if not docs:
+        return []
 
-    scores = logits.tolist()
+    scores = get_cross_encoder().score(query, [doc.page_content for doc in docs])
+    if recency_boost:
+        weights = recency_weights([doc.metadata.get("year") for doc in docs], RECENCY_BOOST_YEARS)
+        scores = [score + recency_boost * weight for score, weight in zip(scores, weights)]
     reranked = [doc for _, doc in sorted(zip(scores, docs), key=lambda x: x[0], reverse=True)]
     return reranked[:top_k]
 
@@ -121,37 +151,266 @@ prompt = PromptTemplate(
 )
 
 
-def build_qa_chain_with_rerank(llm: LLM, retriever: Any, top_k: int = 3):
+# 답변 근거 검증 관련 상수
+# GeminiLLM이 예외 대신 반환하는 실패 응답 접두어 (검증 대상 아님)
+LLM_ERROR_PREFIXES = ("[응답 없음]", "[할당량 초과]", "[LLM 호출 실패]")
+# 프롬프트가 지시한 고정 문구: 참조 문서에 근거가 없어도 정상이므로 검증에서 제외
+GROUNDING_EXEMPT_PHRASES = (
+    "추가 문의가 필요하면 언제든 알려주세요",
+    "정확한 정보가 없습니다",
+    "답변 범위를 벗어납니다",
+    "제공하기 어렵습니다",
+)
+NO_INFO_ANSWER = "정확한 정보가 없습니다. 공식 홈페이지 https://www.bigdataboaz.com 를 참고해주세요."
+# 한글/영문/숫자가 이보다 적은 문장(표 구분선, 기호만 있는 줄 등)은 검증하지 않음
+_MIN_CHECK_CHARS = 8
+_WORD_CHAR = re.compile(r"[0-9A-Za-z가-힣]")
+
+
+def _split_sentences(text: str) -> List[str]:
+    from chunking import SENTENCE_PATTERN
+
+    return [s.strip() for s in SENTENCE_PATTERN.split(text) if s and s.strip()]
+
+
+def _answer_units(answer: str) -> List[str]:
+    """
+    답변을 검증 단위로 분할: 일반 텍스트는 문장 단위, 연속된 마크다운 표 행(|로 시작)은 표 전체를 하나의 단위로 묶음
+    - 표 행을 따로 제거하면 표가 깨지므로 표는 통째로 점수를 매기고 통째로 유지/제거
+    """
+    units: List[str] = []
+    text_lines: List[str] = []
+    table_lines: List[str] = []
+    for line in answer.split("\n") + [""]:
+        if line.lstrip().startswith("|"):
+            if text_lines:
+                units.extend(_split_sentences("\n".join(text_lines)))
+                text_lines = []
+            table_lines.append(line)
+            continue
+        if table_lines:
+            units.append("\n".join(table_lines).strip())
+            table_lines = []
+        text_lines.append(line)
+    units.extend(_split_sentences("\n".join(text_lines)))
+    return units
+
+
+def _is_checkable(sentence: str) -> bool:
+    if any(phrase in sentence for phrase in GROUNDING_EXEMPT_PHRASES):
+        return False
+    return len(_WORD_CHAR.findall(sentence)) >= _MIN_CHECK_CHARS
+
+
+def score_grounding(sentences: List[str], docs: List[Document], scorer: str = GROUNDING_SCORER) -> List[float]:
+    """
+    답변 문장별로 참조 문서에서 가장 잘 뒷받침하는 부분의 점수를 계산 (모델 호출은 한 번의 배치)
+    - "sbert": 답변 문장과 참조 문서 문장을 함께 인코딩하여 최대 코사인 유사도
+    - "cross_encoder": (답변 문장, 참조 문서) 모든 쌍의 rerank logit 중 최댓값
+    """
+    if not sentences:
+        return []
+
+    if scorer == "sbert":
+        from model_runtime import get_query_encoder
+
+        passages = [
+            p for doc in docs for p in _split_sentences(doc.page_content)
+            if len(_WORD_CHAR.findall(p)) >= _MIN_CHECK_CHARS
+        ][:GROUNDING_MAX_PASSAGES]
+        if not passages:
+            return [0.0] * len(sentences)
+        vectors = get_query_encoder().encode(sentences + passages, normalize=True)
+        similarity = vectors[:len(sentences)] @ vectors[len(sentences):].T
+        return similarity.max(axis=1).tolist()
+
+    if scorer == "cross_encoder":
+        from model_runtime import get_cross_encoder
+
+        texts = [doc.page_content for doc in docs]
+        if not texts:
+            return [0.0] * len(sentences)
+        scores = get_cross_encoder().score_pairs([(s, t) for s in sentences for t in texts])
+        return [max(scores[i * len(texts):(i + 1) * len(texts)]) for i in range(len(sentences))]
+
+    raise ValueError(f"지원하지 않는 근거 검증 방식입니다: {scorer} (가능: sbert, cross_encoder)")
+
+
+def check_grounding(
+    answer: str,
+    docs: List[Document],
+    mode: str = GROUNDING_MODE,
+    scorer: str = GROUNDING_SCORER,
+    threshold: Optional[float] = None,
+    max_sentences: int = GROUNDING_MAX_SENTENCES
+) -> Tuple[str, Dict[str, Any]]:
+    """
+    생성된 답변이 참조 문서에 근거하는지 문장 단위로 검증
+    - 고정 안내 문구 / 너무 짧은 문장은 제외하고 앞에서부터 max_sentences개 문장만 검증 (지연시간 상한)
+    - 마크다운 표는 행 단위가 아니라 표 전체를 한 단위로 검증
+    - mode="trim"이면 근거 부족 문장을 답변에서 제거하고, 남는 근거 문장이 없으면 NO_INFO_ANSWER로 대체
+    - 반환: (최종 답변, 검증 결과 딕셔너리)
+    """
+    start = time.perf_counter()
+    threshold = GROUNDING_THRESHOLDS[scorer] if threshold is None else threshold
+
+    sentences = [s for s in _answer_units(answer) if _is_checkable(s)][:max_sentences]
+    scores = score_grounding(sentences, docs, scorer=scorer)
+    checked = [
+        {"sentence": s, "score": round(float(score), 4), "supported": bool(score >= threshold)}
+        for s, score in zip(sentences, scores)
+    ]
+    unsupported = [item["sentence"] for item in checked if not item["supported"]]
+
+    grounding: Dict[str, Any] = {
+        "mode": mode,
+        "scorer": scorer,
+        "threshold": threshold,
+        "supported": not unsupported,
+        "unsupported_count": len(unsupported),
+        "sentences": checked,
+    }
+
+    if mode == "trim" and unsupported:
+        trimmed = answer
+        for sentence in unsupported:
+            trimmed = trimmed.replace(sentence, "", 1)
+        trimmed = re.sub(r"[ \t]+\n", "\n", trimmed)
+        trimmed = re.sub(r"\n{3,}", "\n\n", trimmed).strip()
+        if len(unsupported) == len(checked):
+            trimmed = f"{NO_INFO_ANSWER}\n\n{trimmed}" if trimmed else NO_INFO_ANSWER
+        grounding["original_answer"] = answer
+        answer = trimmed
+
+    grounding["latency_ms"] = round((time.perf_counter() - start) * 1000, 1)
+    return answer, grounding
+
+
+def format_faq_answer(faq_hit: dict) -> str:
+    """
+    FAQ 매칭 결과의 큐레이션된 답변에 공통 마무리 템플릿을 적용
+    """
+    return FAQ_ANSWER_TEMPLATE.format(answer=faq_hit["answer"], question=faq_hit["question"])
+
+
+def build_qa_chain_with_rerank(
+    llm: LLM,
+    retriever: Any,
+    top_k: int = 3,
+    faq_matcher: Any = None,
+    corpus: str = DEFAULT_CORPUS,
+    grounding_mode: str = GROUNDING_MODE
+):
     """
     Cross-Encoder rerank가 통합된 LangChain QA 체인 구성
+    - faq_matcher가 주어지면 FAQ와 높은 유사도로 일치하는 질문은 LLM 호출 없이 바로 응답
+    - corpus: 메트릭 집계용 코퍼스 이름 (retriever/faq_matcher는 해당 코퍼스용으로 생성된 것을 전달)
+    - grounding_mode: "off" | "flag" | "trim", 생성 답변의 근거 검증 결과를 result["grounding"]에 기록
     """
-    def rerank_retriever(query: str) -> List[Document]:
-        initial_docs = retriever.get_relevant_documents(query)
-        return cross_encoder_rerank(query, initial_docs, top_k=top_k)
+    def rerank_retriever(query: str, search_kwargs: Optional[dict] = None) -> List[Document]:
+        # 필터/최신성 파라미터는 지원하는 retriever(search 메서드)에만 전달
+        with stage("retrieve"):
+            if search_kwargs and hasattr(retriever, "search"):
+                initial_docs = retriever.search(query, **search_kwargs)
+            else:
+                initial_docs = retriever.get_relevant_documents(query)
+        with stage("rerank"):
+            return cross_encoder_rerank(query, initial_docs, top_k=top_k)
 
     # LangChain의 RetrievalQA 구조를 커스터마이징
     class CustomQAChain:
+        def __init__(self):
+            self.corpus = corpus
+
         def invoke(self, inputs: dict):
             query = inputs["query"]
-            docs = rerank_retriever(query)
-            context = "\n\n".join(doc.page_content for doc in docs)
-            final_prompt = prompt.format(question=query, context=context)
-            answer = llm(final_prompt)
-            return {"result": answer, "source_documents": docs}
+            # 선택 입력: "filter"(Pinecone 메타데이터 필터), "recency_years"(최근 N년 문서만 검색, 하드 필터)
+            search_kwargs = {
+                "metadata_filter": inputs.get("filter"),
+                "recency_years": inputs.get("recency_years"),
+            }
+            search_kwargs = {k: v for k, v in search_kwargs.items() if v is not None}
+            filtered = bool(search_kwargs) or any(
+                getattr(retriever, attr, None) for attr in ("metadata_filter", "recency_years")
+            )
+
+            # FAQ 빠른 응답: rerank와 Gemini 호출을 모두 건너뜀
+            # - FAQ 항목에는 필터 조건을 적용할 수 없으므로 필터/최신성 조건이 있는 요청은 검색 경로로 처리
+            if faq_matcher is not None and not filtered:
+                with stage("faq_match"):
+                    faq_hit = faq_matcher.match(query)
+                if faq_hit:
+                    logger.info(f"FAQ 매칭 (score={faq_hit['score']:.3f}): {faq_hit['question']}")
+                    faq_doc = Document(
+                        page_content=f"{faq_hit['question']}\n{faq_hit['answer']}",
+                        metadata={
+                            "source": faq_hit["source"],
+                            "row_index": faq_hit["row_index"],
+                            "faq_score": faq_hit["score"],
+                            **{key: faq_hit[key] for key in ("year", "cohort") if key in faq_hit},
+                        },
+                    )
+                    return {"result": format_faq_answer(faq_hit), "source_documents": [faq_doc], "faq_hit": True}
+
+            docs = rerank_retriever(query, search_kwargs)
+            with stage("prompt_format"):
+                context = "\n\n".join(doc.page_content for doc in docs)
+                final_prompt = prompt.format(question=query, context=context)
+            with stage("llm"):
+                answer = llm(final_prompt)
+            result = {"result": answer, "source_documents": docs, "faq_hit": False}
+
+            # 근거 검증: 실패하더라도 답변은 그대로 반환
+            if grounding_mode != "off" and not answer.startswith(LLM_ERROR_PREFIXES):
+                try:
+                    with stage("grounding"):
+                        result["result"], result["grounding"] = check_grounding(answer, docs, mode=grounding_mode)
+                    grounding = result["grounding"]
+                    logger.info(
+                        f"근거 검증: {len(grounding['sentences'])}개 문장 중 {grounding['unsupported_count']}개 "
+                        f"근거 부족 ({grounding['latency_ms']}ms)"
+                    )
+                except Exception as e:
+                    logger.warning(f"근거 검증 실패: {e}")
+            return result
 
     return CustomQAChain()
 
 
-def run_qa_chain(chain, query: str):
+def run_qa_chain(chain, query: str, profile: Optional[bool] = None):
     """
     QA 체인을 실행하여 응답 및 참조 문서를 반환
+    - 코퍼스별 요청 수 / FAQ 적중 / 오류 / 지연시간을 metrics.corpus_metrics에 기록
+    - profile=True(None이면 환경 변수 BOAZ_PROFILE로 결정)이면 단계별 시간과 샘플링 CPU 프로파일을
+      config.PROFILE_DIR에 저장하고 요약을 result["profile"]에 기록
     """
+    if profile is None:
+        profile = profiling_enabled()
+    if not profile:
+        return _run_qa_chain(chain, query)
+
+    with profile_request("qa") as request_profile:
+        request_profile.meta.update(query=query, corpus=getattr(chain, "corpus", DEFAULT_CORPUS))
+        result = _run_qa_chain(chain, query)
+    logger.info(
+        f"프로파일 저장: {request_profile.output_dir or '실패'} (wall {request_profile.report['wall_ms']:.0f}ms, "
+        f"네트워크 {request_profile.report['network_ms']:.0f}ms)"
+    )
+    result["profile"] = {**request_profile.report, "output_dir": request_profile.output_dir}
+    return result
+
+
+def _run_qa_chain(chain, query: str):
+    corpus = getattr(chain, "corpus", DEFAULT_CORPUS)
+    start = time.perf_counter()
     try:
         if hasattr(chain, 'invoke'):
             result = chain.invoke({"query": query})
         else:
             result = chain({"query": query})
+        corpus_metrics.record_request(corpus, time.perf_counter() - start, faq_hit=result.get("faq_hit", False))
         return result
     except Exception as e:
         logger.error(f"QA Chain 실행 오류: {e}", exc_info=True)
+        corpus_metrics.record_request(corpus, time.perf_counter() - start, error=True)
         return {"result": f"[실행 실패] {str(e)}", "source_documents": []}
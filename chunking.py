@@ -0,0 +1,235 @@
+import re
+from bisect import bisect_right
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+from langchain.text_splitter import RecursiveCharacterTextSplitter
+
+from config import CHUNK_OVERLAP, CHUNK_SIZE, CHUNK_STRATEGY, SEMANTIC_CHUNK_THRESHOLD
+
+# (페이지 번호 또는 None, 페이지 텍스트)
+Page = Tuple[Optional[int], str]
+# (청크 텍스트, 청크별 메타데이터: page / page_end / section)
+Chunk = Tuple[str, Dict[str, Any]]
+
+# 제목으로 취급할 줄 패턴 (마크다운 제목, "제1장", "1.2 개요", "■ 모집 일정", "[활동 안내]", "II. 커리큘럼")
+HEADING_PATTERN = re.compile(
+    r"^\s*("
+    r"#{1,6}\s+.+"
+    r"|제\s*\d+\s*[장절조]\b.*"
+    r"|\d+(\.\d+)*[.)]\s+.{1,40}"
+    r"|[■□▶●◆◇○※]\s*.{1,40}"
+    r"|\[[^\]]{1,40}\]"
+    r"|[IVX]+\.\s+.{1,40}"
+    r")\s*$"
+)
+SENTENCE_PATTERN = re.compile(r"(?<=[.!?。])\s+|\n+")
+
+
+def _page_meta(page: Optional[int], page_end: Optional[int] = None) -> Dict[str, Any]:
+    if page is None:
+        return {}
+    return {"page": page, "page_end": page_end if page_end is not None else page}
+
+
+class RecursiveChunker:
+    """
+    기존 방식: 전체 페이지를 이어붙인 뒤 고정 길이 + 중첩으로 분할
+    - 시작 위치(start_index)로 각 청크가 걸친 페이지 범위를 계산해 메타데이터에 기록
+    """
+
+    name = "recursive"
+
+    def __init__(self, chunk_size: int = CHUNK_SIZE, chunk_overlap: int = CHUNK_OVERLAP):
+        self.splitter = RecursiveCharacterTextSplitter(
+            chunk_size=chunk_size,             # 청크 최대 길이
+            chunk_overlap=chunk_overlap,       # 청크 간 중첩 길이
+            length_function=len,               # 기본 길이 측정 함수
+            separators=["\n\n", "\n", " ", ""],  # 청크 구분자 우선순위
+            add_start_index=True,
+        )
+
+    def split_text(self, text: str) -> List[str]:
+        return self.splitter.split_text(text)
+
+    def split_pages(self, pages: Sequence[Page]) -> List[Chunk]:
+        page_starts, offset = [], 0
+        for _, text in pages:
+            page_starts.append(offset)
+            offset += len(text) + 1  # "\n" 구분자
+        full_text = "\n".join(text for _, text in pages)
+
+        chunks: List[Chunk] = []
+        for doc in self.splitter.create_documents([full_text]):
+            start = max(doc.metadata.get("start_index", 0), 0)
+            end = start + max(len(doc.page_content) - 1, 0)
+            first = pages[bisect_right(page_starts, start) - 1][0]
+            last = pages[bisect_right(page_starts, end) - 1][0]
+            chunks.append((doc.page_content, _page_meta(first, last)))
+        return chunks
+
+
+class StructureChunker:
+    """
+    페이지/제목 구조를 따르는 청커
+    - 청크가 페이지 경계를 넘지 않고, 제목 줄에서 새 청크를 시작 (제목은 section 메타데이터로 기록)
+    - 줄 단위로 chunk_size까지 채우므로 중첩이 필요 없음 (기본 overlap 0)
+    - 너무 짧은 구간(min_chunk_size 미만)은 다음 구간과 합쳐 조각 청크를 방지
+    - 제목 다음 줄이 남은 공간에 들어가지 않아도 제목만 있는 청크는 만들지 않고 다음 내용의 첫 조각에 붙임
+    """
+
+    name = "structure"
+
+    def __init__(self, chunk_size: int = CHUNK_SIZE, chunk_overlap: int = 0, min_chunk_size: Optional[int] = None):
+        self.chunk_size = chunk_size
+        self.chunk_overlap = chunk_overlap
+        self.min_chunk_size = min_chunk_size if min_chunk_size is not None else chunk_size // 5
+        self.fallback = RecursiveChunker(chunk_size=chunk_size, chunk_overlap=chunk_overlap)
+
+    def _split_page(self, text: str) -> List[Tuple[str, str]]:
+        """
+        한 페이지를 (청크 텍스트, 소속 제목) 리스트로 분할
+        """
+        chunks: List[Tuple[str, str]] = []
+        buffer: List[str] = []
+        section = ""
+
+        def flush():
+            if buffer:
+                chunks.append(("\n".join(buffer).strip(), section))
+                buffer.clear()
+
+        def buffer_len() -> int:
+            return sum(len(b) + 1 for b in buffer)
+
+        for line in text.splitlines():
+            line = line.strip()
+            if not line:
+                continue
+
+            is_heading = bool(HEADING_PATTERN.match(line))
+            if is_heading and buffer_len() >= self.min_chunk_size:
+                flush()
+            if is_heading and not buffer:
+                section = line
+            current_len = buffer_len()
+
+            room = self.chunk_size - current_len
+            heading_only = bool(buffer) and all(HEADING_PATTERN.match(b) for b in buffer)
+            if heading_only and len(line) > room and room >= self.min_chunk_size:
+                # 제목만 있는 버퍼는 단독 청크로 내보내지 않고, 남은 공간에 맞춰 자른 첫 조각과 합침
+                # 마지막 조각은 버퍼에 남겨 다음 줄과 합쳐지도록 함
+                fallback = RecursiveChunker(chunk_size=room, chunk_overlap=min(self.chunk_overlap, room // 2))
+                pieces = fallback.split_text(line)
+                buffer.append(pieces[0])
+                flush()
+                chunks.extend((piece, section) for piece in pieces[1:-1])
+                if len(pieces) > 1:
+                    buffer.append(pieces[-1])
+                continue
+
+            if len(line) > self.chunk_size:
+                # 한 줄이 chunk_size보다 길면 재귀 분할로 대체
+                flush()
+                chunks.extend((piece, section) for piece in self.fallback.split_text(line))
+                continue
+            if current_len + len(line) > self.chunk_size:
+                flush()
+            buffer.append(line)
+        flush()
+        return [(text, sec) for text, sec in chunks if text]
+
+    def split_text(self, text: str) -> List[str]:
+        return [chunk for chunk, _ in self._split_page(text)]
+
+    def split_pages(self, pages: Sequence[Page]) -> List[Chunk]:
+        chunks: List[Chunk] = []
+        for page, text in pages:
+            for chunk, section in self._split_page(text):
+                meta = _page_meta(page)
+                if section:
+                    meta["section"] = section
+                chunks.append((chunk, meta))
+        return chunks
+
+
+class SemanticChunker:
+    """
+    임베딩 유사도 경계 기반 청커
+    - 페이지 내 문장을 임베딩하여 인접 문장 간 코사인 유사도가 threshold 미만인 지점에서 분할
+    - chunk_size를 넘거나 페이지가 바뀌면 항상 분할
+    - 문장 임베딩은 문서 단위 한 번의 배치로 계산
+    """
+
+    name = "semantic"
+
+    def __init__(
+        self,
+        embed_fn: Optional[Callable[[List[str]], np.ndarray]] = None,
+        chunk_size: int = CHUNK_SIZE,
+        threshold: float = SEMANTIC_CHUNK_THRESHOLD
+    ):
+        if embed_fn is None:
+            from model_runtime import get_query_encoder
+
+            encoder = get_query_encoder()
+            embed_fn = lambda sentences: encoder.encode(sentences, normalize=True)
+        self.embed_fn = embed_fn
+        self.chunk_size = chunk_size
+        self.threshold = threshold
+        self.fallback = RecursiveChunker(chunk_size=chunk_size, chunk_overlap=0)
+
+    def _sentences(self, text: str) -> List[str]:
+        sentences: List[str] = []
+        for sentence in SENTENCE_PATTERN.split(text):
+            sentence = sentence.strip()
+            if not sentence:
+                continue
+            if len(sentence) > self.chunk_size:
+                sentences.extend(self.fallback.split_text(sentence))
+            else:
+                sentences.append(sentence)
+        return sentences
+
+    def split_pages(self, pages: Sequence[Page]) -> List[Chunk]:
+        page_sentences = [(page, self._sentences(text)) for page, text in pages]
+        flat = [s for _, sentences in page_sentences for s in sentences]
+        if not flat:
+            return []
+        vectors = np.asarray(self.embed_fn(flat), dtype=np.float32)
+
+        chunks: List[Chunk] = []
+        pos = 0
+        for page, sentences in page_sentences:
+            buffer: List[str] = []
+            for i, sentence in enumerate(sentences):
+                if buffer:
+                    similarity = float(vectors[pos + i - 1] @ vectors[pos + i])
+                    size = sum(len(b) + 1 for b in buffer) + len(sentence)
+                    if similarity < self.threshold or size > self.chunk_size:
+                        chunks.append((" ".join(buffer), _page_meta(page)))
+                        buffer = []
+                buffer.append(sentence)
+            if buffer:
+                chunks.append((" ".join(buffer), _page_meta(page)))
+            pos += len(sentences)
+        return chunks
+
+    def split_text(self, text: str) -> List[str]:
+        return [chunk for chunk, _ in self.split_pages([(None, text)])]
+
+
+CHUNKERS = {
+    RecursiveChunker.name: RecursiveChunker,
+    StructureChunker.name: StructureChunker,
+    SemanticChunker.name: SemanticChunker,
+}
+
+
+def get_chunker(name: str = CHUNK_STRATEGY, **kwargs):
+    """
+    이름에 해당하는 청커 인스턴스 반환 ("recursive" | "structure" | "semantic")
+    """
+    if name not in CHUNKERS:
+        raise ValueError(f"지원하지 않는 청킹 전략입니다: {name} (가능: {list(CHUNKERS)})")
+    return CHUNKERS[name](**kwargs)
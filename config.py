@@ -6,12 +6,92 @@ USE_SPARSE = True  # False면 Dense 사용
 DENSE_MODEL_NAME = "jhgan/ko-sbert-sts"
 DENSE_INDEX_NAME = "boaz-dense-index"
 ID_TO_TEXT_PATH_DENSE = "data_with_meta/id_to_text_dense.json"
+ID_TO_META_PATH_DENSE = "data_with_meta/id_to_meta_dense.json"
+
+# 업로드 시 임베딩 디스크 캐시 ((모델명, 텍스트 해시) → 벡터, 변경 없는 청크는 재인코딩 생략)
+USE_EMBEDDING_CACHE = True
+EMBEDDING_CACHE_PATH = "data_with_meta/embedding_cache.sqlite"
+EMBEDDING_CACHE_MAX_MB = 512  # 초과 시 오래 사용되지 않은 항목부터 삭제
 
 # Sparse 설정
 SPARSE_MODEL_NAME = "pinecone-sparse-english-v0"
 SPARSE_INDEX_NAME = "boaz-bm25-index"
 ID_TO_TEXT_PATH_SPARSE = "data_with_meta/id_to_text_sparse.json"
+ID_TO_META_PATH_SPARSE = "data_with_meta/id_to_meta_sparse.json"
+# BM25 토크나이저: "kiwi"(형태소 분석, kiwipiepy 필요) | "char_ngram"(음절 bigram) | "default"(pinecone_text 영어 토크나이저)
+# 변경 시 sparse 인덱스를 다시 업로드해야 함 (업로드/검색 시 같은 토크나이저 사용)
+SPARSE_TOKENIZER = "kiwi"
+
+# Cross-Encoder (rerank) 설정
+CROSS_ENCODER_MODEL_NAME = "cross-encoder/ms-marco-MiniLM-L-6-v2"
+
+# CPU 추론 백엔드 설정 (reranker / 쿼리 인코더 공통)
+# "torch": fp32 PyTorch, "torch_int8": 동적 int8 양자화 PyTorch,
+# "onnx": ONNX Runtime fp32, "onnx_int8": ONNX Runtime 동적 int8 (export_models.py로 사전 생성 필요)
+INFERENCE_BACKEND = "torch"
+ONNX_MODEL_DIR = "models/onnx"
+INFERENCE_NUM_THREADS = 0  # 0이면 라이브러리 기본값 사용 (코어 수에 맞춰 조정)
+
+# 추론 위치: "local"(프로세스마다 모델 로드) | "sidecar"(inference_sidecar.py 프로세스 하나가 모델을 소유, 워커는 소켓으로 요청)
+# sidecar 모드에서는 쿼리 인코더 / Cross-Encoder / BM25 질의 인코딩이 모두 사이드카에서 실행됨
+INFERENCE_MODE = "local"
+INFERENCE_SOCKET_PATH = "/tmp/boaz_rag_inference.sock"
+SIDECAR_MAX_BATCH = 64       # 요청 간 마이크로 배치 최대 항목 수 (문장 / 문서 쌍 단위)
+SIDECAR_BATCH_WAIT_MS = 5    # 첫 요청 도착 후 같은 배치에 합칠 요청을 기다리는 최대 시간
+SIDECAR_HANDSHAKE_TIMEOUT_S = 2.0  # 연결 인증(authkey challenge) 응답 대기 상한 (응답 없는 연결이 다른 워커를 막지 않도록)
 
 # 공통 설정
 TOP_K = 20
 DATA_PATH = "data"
+
+# 청킹 설정
+# "recursive": 전체 텍스트 고정 길이 + 중첩 분할 (기존 방식)
+# "structure": 페이지/제목 경계를 따르는 분할 (중첩 없음)
+# "semantic": 문장 임베딩 유사도 경계 기반 분할
+# 변경 시 dense/sparse 인덱스를 다시 업로드해야 함 (benchmarks/chunking_benchmark.py로 비교)
+CHUNK_STRATEGY = "recursive"
+CHUNK_SIZE = 500
+CHUNK_OVERLAP = 100      # recursive 전략에서만 사용
+SEMANTIC_CHUNK_THRESHOLD = 0.5  # 인접 문장 코사인 유사도가 이보다 낮으면 청크 분할
+
+# 메타데이터 필터 / 최신성 설정
+# 최신성 가산점: rerank 점수에 최근 문서일수록 큰 가산점을 더함 (오래된 문서도 후보에서 제외되지 않아 과거 질문에 답변 가능)
+RECENCY_BOOST = 1.0        # 최신 연도 / 연도 없는 문서에 더하는 Cross-Encoder logit 가산점 (0이면 비활성화)
+RECENCY_BOOST_YEARS = 3    # 가산점이 0이 되기까지의 연수 (최신 연도에서 1년마다 선형 감소)
+# 최신성 하드 필터: 최근 N년 문서(및 연도 없는 문서)만 Pinecone 질의 후보로 사용 (None이면 비활성화)
+# 기본은 비활성화, 체인 입력 "recency_years"로 요청별 지정 가능
+RECENCY_YEARS = None
+RECENCY_MIN_MATCHES = 5  # 최근 N년 문서가 이보다 적으면 기간을 1년씩 넓힘
+FILTERED_TOP_K = 10      # 호출자가 메타데이터 필터를 지정한 검색은 후보 품질이 높으므로 더 적은 후보만 rerank
+
+# FAQ 빠른 응답 설정 (CSV 질문/답변 쌍을 LLM 호출 없이 바로 응답)
+USE_FAQ = True
+FAQ_INDEX_PATH = "data_with_meta/faq_index.json"
+FAQ_SCORE_THRESHOLD = 0.9  # 질문 간 코사인 유사도가 이 값 이상이면 큐레이션된 답변 반환
+FAQ_TIE_MARGIN = 0.02      # 최고 점수와 이 차이 이내인 FAQ 항목끼리는 최신 연도/기수 항목을 우선 (기수별 CSV에 같은 질문이 있을 때)
+FAQ_ANSWER_TEMPLATE = "{answer}\n\n추가 문의가 필요하면 언제든 알려주세요."
+
+# 답변 근거 검증 (두 번째 LLM 호출 없이 이미 로드된 모델로 답변 문장 ↔ 참조 문서 점수를 한 번의 배치로 계산)
+# "off": 비활성화, "flag": 문장별 점수만 결과에 기록, "trim": 근거가 부족한 문장을 답변에서 제거
+GROUNDING_MODE = "flag"
+# "sbert": 쿼리 인코더 코사인 유사도 (답변 문장 ↔ 참조 문서 문장), "cross_encoder": rerank 모델 logit (답변 문장 ↔ 참조 문서)
+GROUNDING_SCORER = "sbert"
+GROUNDING_THRESHOLDS = {"sbert": 0.5, "cross_encoder": 0.0}  # 점수가 이보다 낮은 문장은 근거 부족으로 판단
+GROUNDING_MAX_SENTENCES = 12   # 검증할 답변 문장 수 상한 (검증 지연시간 상한)
+GROUNDING_MAX_PASSAGES = 60    # sbert 방식에서 비교할 참조 문서 문장 수 상한
+
+# 요청 프로파일링 (환경 변수 BOAZ_PROFILE=1 또는 앱 URL의 ?profile=1 일 때만 활성화)
+# 단계별 시간(네트워크 대기 / 연산 분리)과 샘플링 CPU 프로파일(collapsed stack, 플레임 그래프용)을 PROFILE_DIR에 저장
+PROFILE_ENV = "BOAZ_PROFILE"
+PROFILE_URL_ENV = "BOAZ_PROFILE_ALLOW_URL"  # 운영자가 1로 설정한 경우에만 URL의 ?profile=1을 허용 (공개 앱 방문자 차단)
+PROFILE_DIR = "profiles"
+PROFILE_MAX_RUNS = 100   # PROFILE_DIR에 보관할 최대 요청 수 (초과하면 오래된 것부터 삭제)
+PROFILE_SAMPLE_INTERVAL_MS = 5
+
+# 코퍼스(테넌트) 레지스트리: 코퍼스마다 인덱스 / 청크 저장소 / 원본 폴더를 분리하고 모델은 프로세스 내에서 공유
+# 비어 있는 항목은 코퍼스 이름으로부터 자동 유도됨 (corpus.get_corpus 참고)
+# 예: "cohort-22": {"data_path": "data/cohort-22"}
+DEFAULT_CORPUS = "default"
+CORPORA = {
+    DEFAULT_CORPUS: {},
+}
@@ -0,0 +1,67 @@
+import os
+from typing import Any, Dict, List, Optional
+
+from config import (
+    CORPORA,
+    DATA_PATH,
+    DEFAULT_CORPUS,
+    DENSE_INDEX_NAME,
+    FAQ_INDEX_PATH,
+    ID_TO_META_PATH_DENSE,
+    ID_TO_META_PATH_SPARSE,
+    ID_TO_TEXT_PATH_DENSE,
+    ID_TO_TEXT_PATH_SPARSE,
+    SPARSE_INDEX_NAME,
+)
+
+# 코퍼스별 메타 데이터(청크 매핑, FAQ 인덱스 등) 저장 루트
+CORPUS_META_ROOT = "data_with_meta"
+
+
+def _default_settings(name: str) -> Dict[str, Any]:
+    """
+    코퍼스 이름으로부터 기본 경로/인덱스명을 유도
+    - 기본 코퍼스는 기존 단일 코퍼스 설정을 그대로 사용 (하위 호환)
+    - 그 외 코퍼스는 data/<name>, data_with_meta/<name>/..., boaz-*-<name> 인덱스 사용
+    """
+    if name == DEFAULT_CORPUS:
+        return {
+            "data_path": DATA_PATH,
+            "dense_index_name": DENSE_INDEX_NAME,
+            "sparse_index_name": SPARSE_INDEX_NAME,
+            "id_to_text_path_dense": ID_TO_TEXT_PATH_DENSE,
+            "id_to_text_path_sparse": ID_TO_TEXT_PATH_SPARSE,
+            "id_to_meta_path_dense": ID_TO_META_PATH_DENSE,
+            "id_to_meta_path_sparse": ID_TO_META_PATH_SPARSE,
+            "faq_index_path": FAQ_INDEX_PATH,
+        }
+
+    meta_dir = os.path.join(CORPUS_META_ROOT, name)
+    return {
+        "data_path": os.path.join(DATA_PATH, name),
+        "dense_index_name": f"boaz-dense-{name}",
+        "sparse_index_name": f"boaz-bm25-{name}",
+        "id_to_text_path_dense": os.path.join(meta_dir, "id_to_text_dense.json"),
+        "id_to_text_path_sparse": os.path.join(meta_dir, "id_to_text_sparse.json"),
+        "id_to_meta_path_dense": os.path.join(meta_dir, "id_to_meta_dense.json"),
+        "id_to_meta_path_sparse": os.path.join(meta_dir, "id_to_meta_sparse.json"),
+        "faq_index_path": os.path.join(meta_dir, "faq_index.json"),
+    }
+
+
+def list_corpora() -> List[str]:
+    """
+    등록된 코퍼스 이름 목록 반환
+    """
+    return list(CORPORA.keys())
+
+
+def get_corpus(name: Optional[str] = None) -> Dict[str, Any]:
+    """
+    코퍼스 설정 반환 (name이 없으면 기본 코퍼스)
+    - config.CORPORA에 지정된 값이 유도된 기본값을 덮어씀
+    """
+    name = name or DEFAULT_CORPUS
+    if name not in CORPORA:
+        raise ValueError(f"등록되지 않은 코퍼스입니다: {name} (가능: {list_corpora()})")
+    return {"name": name, **_default_settings(name), **CORPORA[name]}
@@ -0,0 +1,232 @@
+import os
+import sys
+import json
+import argparse
+from typing import Any, Callable, Dict, List, Tuple
+
+import numpy as np
+
+from config import (
+    CROSS_ENCODER_MODEL_NAME,
+    DENSE_MODEL_NAME,
+    ID_TO_TEXT_PATH_DENSE,
+    ID_TO_TEXT_PATH_SPARSE,
+    ONNX_MODEL_DIR,
+    TOP_K,
+)
+from model_runtime import (
+    ONNX_FP32_FILE,
+    ONNX_INT8_FILE,
+    RUNTIME_CONFIG_FILE,
+    CrossEncoderScorer,
+    QueryEncoder,
+    onnx_model_dir,
+)
+
+# 매핑 파일이 없을 때 사용할 기본 샘플
+SAMPLE_QUERIES = [
+    "보아즈는 뭐하는 곳이야?",
+    "지원 자격이 어떻게 되나요?",
+    "면접은 어떻게 진행되나요?",
+    "활동 기간은 얼마나 되나요?",
+    "분석 세션과 엔지니어링 세션의 차이가 뭐야?",
+]
+SAMPLE_DOCS = [
+    "BOAZ는 국내 최초의 대학생 빅데이터 연합동아리로, 분석·시각화·엔지니어링 세션을 운영합니다.",
+    "지원 자격은 빅데이터에 관심 있는 대학생 및 대학원생이며, 전공과 무관하게 지원할 수 있습니다.",
+    "서류 합격자를 대상으로 대면 면접을 진행하며, 기술 질문과 인성 질문이 포함됩니다.",
+    "활동 기간은 1년이며, 기초 세션 이후 주제 분석 및 컨퍼런스 발표로 이어집니다.",
+    "엔지니어링 세션은 데이터 파이프라인과 인프라를, 분석 세션은 모델링과 통계를 다룹니다.",
+    "정기 세션은 매주 토요일 오후에 진행됩니다.",
+]
+
+# fp32 대비 허용 기준
+PARITY_MIN_COSINE = 0.99          # 임베딩 코사인 유사도 최솟값
+PARITY_MIN_TOPK_AGREEMENT = 0.9   # rerank 상위 3개 문서 일치율 평균
+PARITY_MIN_SPEARMAN = 0.95        # rerank 점수 순위 상관 평균
+
+
+def load_sample_texts(max_docs: int = TOP_K) -> Tuple[List[str], List[str]]:
+    """
+    패리티 체크/벤치마크용 (질의, 문서) 샘플 반환
+    - 로컬 매핑 파일이 있으면 실제 청크를 문서로 사용
+    """
+    docs = SAMPLE_DOCS
+    for path in (ID_TO_TEXT_PATH_DENSE, ID_TO_TEXT_PATH_SPARSE):
+        if os.path.exists(path):
+            with open(path, "r", encoding="utf-8") as f:
+                docs = [text for text in json.load(f).values() if text][:max_docs]
+            break
+    return SAMPLE_QUERIES, docs
+
+
+def _export_onnx(model: Any, sample: Dict[str, Any], output_fn: Callable, output_name: str, path: str) -> None:
+    """
+    토크나이저 출력 이름을 그대로 ONNX 입력 이름으로 사용하여 동적 배치/길이 그래프로 export
+    """
+    import torch
+
+    input_names = list(sample.keys())
+
+    class _NamedInputWrapper(torch.nn.Module):
+        def __init__(self):
+            super().__init__()
+            self.model = model
+
+        def forward(self, *args):
+            return output_fn(self.model(**dict(zip(input_names, args))))
+
+    dynamic_axes = {name: {0: "batch", 1: "sequence"} for name in input_names}
+    dynamic_axes[output_name] = {0: "batch"}
+    torch.onnx.export(
+        _NamedInputWrapper().eval(),
+        tuple(sample[name] for name in input_names),
+        path,
+        input_names=input_names,
+        output_names=[output_name],
+        dynamic_axes=dynamic_axes,
+        opset_version=14,
+    )
+
+
+def _quantize(export_dir: str) -> None:
+    """
+    fp32 ONNX 그래프를 동적 int8 양자화 (가중치 int8, 활성값은 런타임 양자화)
+    """
+    from onnxruntime.quantization import QuantType, quantize_dynamic
+
+    quantize_dynamic(
+        os.path.join(export_dir, ONNX_FP32_FILE),
+        os.path.join(export_dir, ONNX_INT8_FILE),
+        weight_type=QuantType.QInt8,
+    )
+
+
+def export_cross_encoder(model_name: str = CROSS_ENCODER_MODEL_NAME) -> str:
+    """
+    Cross-Encoder를 ONNX(fp32 + int8)로 export
+    """
+    from transformers import AutoModelForSequenceClassification, AutoTokenizer
+
+    export_dir = onnx_model_dir(model_name)
+    os.makedirs(export_dir, exist_ok=True)
+
+    tokenizer = AutoTokenizer.from_pretrained(model_name)
+    model = AutoModelForSequenceClassification.from_pretrained(model_name).eval()
+    sample = dict(tokenizer.batch_encode_plus(
+        [(SAMPLE_QUERIES[0], SAMPLE_DOCS[0])], return_tensors="pt", truncation=True, padding=True
+    ))
+
+    _export_onnx(model, sample, lambda out: out.logits, "logits", os.path.join(export_dir, ONNX_FP32_FILE))
+    _quantize(export_dir)
+    tokenizer.save_pretrained(export_dir)
+    with open(os.path.join(export_dir, RUNTIME_CONFIG_FILE), "w", encoding="utf-8") as f:
+        json.dump({"model_name": model_name, "max_length": tokenizer.model_max_length}, f, indent=2)
+
+    print(f"✅ Cross-Encoder export 완료: {export_dir}")
+    return export_dir
+
+
+def export_query_encoder(model_name: str = DENSE_MODEL_NAME) -> str:
+    """
+    SBERT 인코더의 트랜스포머 본체를 ONNX(fp32 + int8)로 export
+    - pooling(mean)은 런타임에서 numpy로 수행하므로 last_hidden_state만 출력
+    """
+    from sentence_transformers import SentenceTransformer
+
+    export_dir = onnx_model_dir(model_name)
+    os.makedirs(export_dir, exist_ok=True)
+
+    st_model = SentenceTransformer(model_name, device="cpu")
+    pooling = st_model[1].get_pooling_mode_str() if len(st_model) > 1 else "mean"
+    if pooling != "mean":
+        print(f"[WARN] {model_name}의 pooling 방식이 mean이 아닙니다: {pooling} (ONNX 런타임은 mean pooling 사용)")
+
+    tokenizer = st_model.tokenizer
+    transformer = st_model[0].auto_model.eval()
+    sample = dict(tokenizer([SAMPLE_DOCS[0]], return_tensors="pt", truncation=True, padding=True))
+
+    _export_onnx(transformer, sample, lambda out: out[0], "last_hidden_state", os.path.join(export_dir, ONNX_FP32_FILE))
+    _quantize(export_dir)
+    tokenizer.save_pretrained(export_dir)
+    with open(os.path.join(export_dir, RUNTIME_CONFIG_FILE), "w", encoding="utf-8") as f:
+        json.dump({"model_name": model_name, "max_length": st_model.max_seq_length, "pooling": "mean"}, f, indent=2)
+
+    print(f"✅ 쿼리 인코더 export 완료: {export_dir}")
+    return export_dir
+
+
+def _spearman(a: List[float], b: List[float]) -> float:
+    if len(a) < 2:
+        return 1.0
+    rank_a = np.argsort(np.argsort(a))
+    rank_b = np.argsort(np.argsort(b))
+    return float(np.corrcoef(rank_a, rank_b)[0, 1])
+
+
+def check_parity(backends: List[str]) -> bool:
+    """
+    fp32 PyTorch 결과를 기준으로 각 백엔드의 정확도 패리티를 확인
+    - 인코더: 임베딩 코사인 유사도
+    - Cross-Encoder: 점수 최대 오차, 순위 상관, 상위 3개 일치율
+    """
+    queries, docs = load_sample_texts()
+    passed = True
+
+    ref_encoder = QueryEncoder(backend="torch")
+    ref_vectors = ref_encoder.encode(queries + docs, normalize=True)
+    ref_scorer = CrossEncoderScorer(backend="torch")
+    ref_scores = [ref_scorer.score(q, docs) for q in queries]
+
+    for backend in backends:
+        vectors = QueryEncoder(backend=backend).encode(queries + docs, normalize=True)
+        cosine = (ref_vectors * vectors).sum(axis=1)
+        enc_ok = float(cosine.min()) >= PARITY_MIN_COSINE
+
+        scorer = CrossEncoderScorer(backend=backend)
+        max_diff, spearmans, agreements = 0.0, [], []
+        for q, ref in zip(queries, ref_scores):
+            cand = scorer.score(q, docs)
+            max_diff = max(max_diff, float(np.max(np.abs(np.asarray(ref) - np.asarray(cand)))))
+            spearmans.append(_spearman(ref, cand))
+            k = min(3, len(docs))
+            top_ref = set(np.argsort(ref)[::-1][:k])
+            top_cand = set(np.argsort(cand)[::-1][:k])
+            agreements.append(len(top_ref & top_cand) / k)
+        rerank_ok = (
+            float(np.mean(spearmans)) >= PARITY_MIN_SPEARMAN
+            and float(np.mean(agreements)) >= PARITY_MIN_TOPK_AGREEMENT
+        )
+
+        status = "✅" if enc_ok and rerank_ok else "❌"
+        print(
+            f"{status} [{backend}] 인코더 cosine min={cosine.min():.4f} mean={cosine.mean():.4f} | "
+            f"rerank max|Δ|={max_diff:.4f} spearman={np.mean(spearmans):.4f} top3={np.mean(agreements):.2f}"
+        )
+        passed = passed and enc_ok and rerank_ok
+
+    return passed
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Cross-Encoder / SBERT 인코더 ONNX·int8 export 및 패리티 체크")
+    parser.add_argument("--skip-export", action="store_true", help="export 없이 패리티 체크만 수행")
+    parser.add_argument(
+        "--backends", nargs="+", default=["torch_int8", "onnx", "onnx_int8"],
+        help="fp32 PyTorch와 비교할 백엔드 목록",
+    )
+    args = parser.parse_args()
+
+    if not args.skip_export:
+        os.makedirs(ONNX_MODEL_DIR, exist_ok=True)
+        export_cross_encoder()
+        export_query_encoder()
+
+    if not check_parity(args.backends):
+        print("❌ 패리티 기준을 만족하지 못한 백엔드가 있습니다. config.INFERENCE_BACKEND 변경 전 확인하세요.")
+        sys.exit(1)
+    print("✅ 모든 백엔드가 fp32 패리티 기준을 만족합니다.")
+
+
+if __name__ == "__main__":
+    main()
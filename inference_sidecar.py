@@ -0,0 +1,426 @@
+import os
+import json
+import time
+import queue
+import socket
+import struct
+import logging
+import argparse
+import threading
+from concurrent.futures import Future
+from functools import lru_cache
+from multiprocessing.connection import Client, Listener, answer_challenge, deliver_challenge
+from typing import Any, Callable, Dict, List, Sequence, Tuple
+
+import numpy as np
+
+from config import (
+    CORPORA,
+    CROSS_ENCODER_MODEL_NAME,
+    DENSE_MODEL_NAME,
+    INFERENCE_BACKEND,
+    INFERENCE_SOCKET_PATH,
+    SIDECAR_BATCH_WAIT_MS,
+    SIDECAR_HANDSHAKE_TIMEOUT_S,
+    SIDECAR_MAX_BATCH,
+    SPARSE_TOKENIZER,
+    USE_SPARSE,
+)
+
+# 로그 설정
+logger = logging.getLogger(__name__)
+logger.setLevel(logging.INFO)
+
+# 소켓 연결 인증 키 (같은 호스트의 다른 사용자가 사이드카에 요청을 보내지 못하도록 .env에 반드시 지정)
+AUTHKEY_ENV = "INFERENCE_SIDECAR_AUTHKEY"
+
+
+def _authkey() -> bytes:
+    authkey = os.getenv(AUTHKEY_ENV)
+    if not authkey:
+        raise ValueError(f"❌ {AUTHKEY_ENV} 환경 변수가 설정되지 않았습니다. (사이드카와 워커가 같은 값을 사용해야 함)")
+    return authkey.encode("utf-8")
+
+
+# -----------------------------------------------------------------------------
+# 클라이언트 (웹 워커 쪽): model_runtime.get_query_encoder / get_cross_encoder가 sidecar 모드에서 반환
+# -----------------------------------------------------------------------------
+
+class SidecarClient:
+    """
+    추론 사이드카 Unix 소켓 클라이언트
+    - multiprocessing.connection은 연결 하나를 여러 스레드가 동시에 쓸 수 없으므로 스레드별 연결을 유지
+    - 연결이 끊기면(사이드카 재시작 등) 한 번 재연결 후 재시도 (요청은 모두 멱등)
+    """
+
+    def __init__(self, address: str = INFERENCE_SOCKET_PATH):
+        self.address = address
+        self._local = threading.local()
+
+    def _connection(self):
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = Client(self.address, family="AF_UNIX", authkey=_authkey())
+            self._local.conn = conn
+        return conn
+
+    def call(self, request: Dict[str, Any]) -> Any:
+        from profiling import stage
+
+        # 사이드카의 연산은 이 프로세스 입장에서는 응답 대기이므로 network로 분류
+        with stage(f"sidecar.{request['op']}", kind="network"):
+            return self._call(request)
+
+    def _call(self, request: Dict[str, Any]) -> Any:
+        for attempt in range(2):
+            try:
+                conn = self._connection()
+                conn.send(request)
+                response = conn.recv()
+                break
+            except (EOFError, OSError) as e:
+                self._local.conn = None
+                if attempt:
+                    raise ConnectionError(
+                        f"추론 사이드카에 연결할 수 없습니다: {self.address} (python inference_sidecar.py 로 먼저 실행하세요)"
+                    ) from e
+
+        if not response["ok"]:
+            raise RuntimeError(f"추론 사이드카 오류: {response['error']}")
+        return response["result"]
+
+
+@lru_cache(maxsize=None)
+def get_client(address: str = INFERENCE_SOCKET_PATH) -> SidecarClient:
+    return SidecarClient(address)
+
+
+class RemoteQueryEncoder:
+    """
+    사이드카의 쿼리 인코더를 호출하는 QueryEncoder 대체 (encode 인터페이스 동일)
+    """
+
+    def __init__(self, model_name: str = DENSE_MODEL_NAME, backend: str = INFERENCE_BACKEND):
+        self.model_name = model_name
+        self.backend = backend
+
+    def encode(self, texts: Sequence[str], normalize: bool = False) -> np.ndarray:
+        texts = list(texts)
+        if not texts:
+            return np.zeros((0, 0), dtype=np.float32)
+        result = get_client().call({
+            "op": "encode", "model": self.model_name, "backend": self.backend,
+            "normalize": normalize, "items": texts,
+        })
+        return np.asarray(result, dtype=np.float32)
+
+
+class RemoteCrossEncoder:
+    """
+    사이드카의 Cross-Encoder를 호출하는 CrossEncoderScorer 대체 (score / score_pairs 인터페이스 동일)
+    """
+
+    def __init__(self, model_name: str = CROSS_ENCODER_MODEL_NAME, backend: str = INFERENCE_BACKEND):
+        self.model_name = model_name
+        self.backend = backend
+
+    def score_pairs(self, pairs: List[Tuple[str, str]]) -> List[float]:
+        if not pairs:
+            return []
+        return list(get_client().call({
+            "op": "score_pairs", "model": self.model_name, "backend": self.backend, "items": list(pairs),
+        }))
+
+    def score(self, query: str, texts: Sequence[str]) -> List[float]:
+        return self.score_pairs([(query, text) for text in texts])
+
+
+class RemoteBM25Encoder:
+    """
+    사이드카가 보관하는 BM25Encoder로 질의를 인코딩 (워커는 말뭉치 fit / 형태소 분석기 로드를 생략)
+    - 사이드카는 같은 매핑 파일과 토크나이저로 fit하므로 업로드 시와 토큰 해시가 일치
+    """
+
+    def __init__(self, id_to_text_path: str, tokenizer_name: str = SPARSE_TOKENIZER):
+        self.id_to_text_path = os.path.abspath(id_to_text_path)
+        self.tokenizer_name = tokenizer_name
+
+    def encode_queries(self, texts: Sequence[str]) -> List[Dict[str, list]]:
+        return list(get_client().call({
+            "op": "bm25_queries", "path": self.id_to_text_path, "tokenizer": self.tokenizer_name,
+            "items": list(texts),
+        }))
+
+
+# -----------------------------------------------------------------------------
+# 서버 (사이드카 프로세스): 모델을 한 번만 로드하고 동시 요청을 마이크로 배치로 묶어 실행
+# -----------------------------------------------------------------------------
+
+class _Pending:
+    __slots__ = ("items", "future")
+
+    def __init__(self, items: List[Any]):
+        self.items = items
+        self.future: Future = Future()
+
+
+class MicroBatcher:
+    """
+    여러 연결에서 들어온 요청을 하나의 모델 호출로 묶는 배처
+    - 첫 요청이 도착하면 max_wait_ms 동안(또는 max_batch 항목이 찰 때까지) 뒤따르는 요청을 모아
+      항목을 이어붙여 fn을 한 번 호출하고, 결과를 요청별로 다시 나눠 돌려줌
+    - 동시 요청이 없어도 첫 요청은 최대 max_wait_ms까지 기다리므로, 이 값이 배치화로 늘어나는 지연의 상한
+    """
+
+    def __init__(self, fn: Callable[[List[Any]], Sequence[Any]], max_batch: int = SIDECAR_MAX_BATCH,
+                 max_wait_ms: float = SIDECAR_BATCH_WAIT_MS):
+        self.fn = fn
+        self.max_batch = max_batch
+        self.max_wait_s = max_wait_ms / 1000
+        self.batches = 0
+        self.items = 0
+        self._queue: "queue.Queue[_Pending]" = queue.Queue()
+        threading.Thread(target=self._run, daemon=True).start()
+
+    def submit(self, items: List[Any]) -> Sequence[Any]:
+        pending = _Pending(items)
+        self._queue.put(pending)
+        return pending.future.result()
+
+    def _run(self) -> None:
+        while True:
+            batch = [self._queue.get()]
+            size = len(batch[0].items)
+            deadline = time.monotonic() + self.max_wait_s
+            while size < self.max_batch:
+                timeout = deadline - time.monotonic()
+                if timeout <= 0:
+                    break
+                try:
+                    nxt = self._queue.get(timeout=timeout)
+                except queue.Empty:
+                    break
+                batch.append(nxt)
+                size += len(nxt.items)
+
+            flat = [item for pending in batch for item in pending.items]
+            try:
+                results = self.fn(flat)
+            except Exception as e:
+                for pending in batch:
+                    pending.future.set_exception(e)
+                continue
+
+            self.batches += 1
+            self.items += len(flat)
+            pos = 0
+            for pending in batch:
+                pending.future.set_result(results[pos:pos + len(pending.items)])
+                pos += len(pending.items)
+
+
+@lru_cache(maxsize=None)
+def _set_recv_timeout(conn, seconds: float) -> None:
+    """
+    Connection의 소켓에 수신 타임아웃(SO_RCVTIMEO) 설정 (0이면 해제)
+    - Connection은 blocking os.read를 쓰므로 settimeout 대신 소켓 옵션으로 지정하며, 시간 초과 시 OSError 발생
+    """
+    sock = socket.socket(fileno=os.dup(conn.fileno()))
+    try:
+        sec = int(seconds)
+        sock.setsockopt(socket.SOL_SOCKET, socket.SO_RCVTIMEO, struct.pack("ll", sec, int((seconds - sec) * 1e6)))
+    finally:
+        sock.close()
+
+
+def _load_bm25(id_to_text_path: str, tokenizer_name: str):
+    from retriever.korean_tokenizer import create_bm25_encoder
+
+    with open(id_to_text_path, "r", encoding="utf-8") as f:
+        texts = list(json.load(f).values())
+    logger.info(f"BM25 인코더 fit: {id_to_text_path} ({tokenizer_name}, {len(texts)}개 문서)")
+    return create_bm25_encoder(texts, tokenizer_name=tokenizer_name)
+
+
+class InferenceSidecar:
+    """
+    모델을 소유하고 Unix 소켓으로 embed / rerank / BM25 질의 인코딩 요청을 처리하는 사이드카 서버
+    - 연결마다 스레드 하나, 모델 호출은 (연산, 모델, 옵션)별 MicroBatcher로 직렬화 + 배치화
+    """
+
+    def __init__(self, address: str = INFERENCE_SOCKET_PATH, max_batch: int = SIDECAR_MAX_BATCH,
+                 max_wait_ms: float = SIDECAR_BATCH_WAIT_MS):
+        self.address = address
+        self.max_batch = max_batch
+        self.max_wait_ms = max_wait_ms
+        self._batchers: Dict[tuple, MicroBatcher] = {}
+        self._lock = threading.Lock()
+
+    def _make_fn(self, key: tuple) -> Callable[[List[Any]], Sequence[Any]]:
+        from model_runtime import load_cross_encoder, load_query_encoder
+
+        op = key[0]
+        if op == "encode":
+            _, model, backend, normalize = key
+            encoder = load_query_encoder(model, backend)
+            return lambda texts: encoder.encode(texts, normalize=normalize)
+        if op == "score_pairs":
+            _, model, backend = key
+            scorer = load_cross_encoder(model, backend)
+            return scorer.score_pairs
+        if op == "bm25_queries":
+            _, path, tokenizer = key
+            encoder = _load_bm25(path, tokenizer)
+            return encoder.encode_queries
+        raise ValueError(f"지원하지 않는 요청입니다: {op}")
+
+    def _batcher(self, key: tuple) -> MicroBatcher:
+        with self._lock:
+            batcher = self._batchers.get(key)
+        if batcher is not None:
+            return batcher
+
+        # 모델 로드 / BM25 학습은 락 밖에서 수행 (다른 배처의 요청과 stats 조회를 막지 않도록)
+        fn = self._make_fn(key)
+        with self._lock:
+            if key not in self._batchers:
+                self._batchers[key] = MicroBatcher(fn, self.max_batch, self.max_wait_ms)
+            return self._batchers[key]
+
+    @staticmethod
+    def _key(request: Dict[str, Any]) -> tuple:
+        op = request["op"]
+        if op == "encode":
+            return (op, request["model"], request["backend"], bool(request["normalize"]))
+        if op == "score_pairs":
+            return (op, request["model"], request["backend"])
+        if op == "bm25_queries":
+            return (op, request["path"], request["tokenizer"])
+        raise ValueError(f"지원하지 않는 요청입니다: {op}")
+
+    def handle(self, request: Dict[str, Any]) -> Any:
+        if request["op"] == "stats":
+            return self.stats()
+        return self._batcher(self._key(request)).submit(request["items"])
+
+    def stats(self) -> Dict[str, Any]:
+        """
+        배처별 호출 수 / 평균 배치 크기 (마이크로 배치 효과 확인용)
+        """
+        from model_runtime import loaded_models
+
+        with self._lock:
+            batchers = dict(self._batchers)
+        return {
+            "loaded_models": loaded_models(),
+            "batchers": {
+                "/".join(map(str, key)): {
+                    "batches": b.batches,
+                    "items": b.items,
+                    "avg_batch": round(b.items / b.batches, 2) if b.batches else 0.0,
+                }
+                for key, b in batchers.items()
+            },
+        }
+
+    def _serve_connection(self, conn, authkey: bytes) -> None:
+        with conn:
+            # 인증은 연결별 스레드에서 수신 타임아웃을 걸고 수행 (accept 스레드가 응답 없는 연결에 묶이지 않도록)
+            try:
+                _set_recv_timeout(conn, SIDECAR_HANDSHAKE_TIMEOUT_S)
+                deliver_challenge(conn, authkey)
+                answer_challenge(conn, authkey)
+                _set_recv_timeout(conn, 0)
+            except Exception as e:
+                logger.warning(f"사이드카 연결 인증 실패: {e}")
+                return
+
+            while True:
+                try:
+                    request = conn.recv()
+                except (EOFError, OSError):
+                    return
+                try:
+                    response = {"ok": True, "result": self.handle(request)}
+                except Exception as e:
+                    logger.error(f"사이드카 요청 처리 오류: {e}", exc_info=True)
+                    response = {"ok": False, "error": str(e)}
+                try:
+                    conn.send(response)
+                except OSError:
+                    return
+
+    def preload(self) -> None:
+        """
+        기본 쿼리 인코더 / Cross-Encoder (및 sparse 모드면 코퍼스별 BM25)를 미리 로드하여 첫 요청 지연 제거
+        """
+        from corpus import get_corpus
+
+        self._batcher(("encode", DENSE_MODEL_NAME, INFERENCE_BACKEND, False))
+        self._batcher(("encode", DENSE_MODEL_NAME, INFERENCE_BACKEND, True))
+        self._batcher(("score_pairs", CROSS_ENCODER_MODEL_NAME, INFERENCE_BACKEND))
+        if USE_SPARSE:
+            for name in CORPORA:
+                path = os.path.abspath(get_corpus(name)["id_to_text_path_sparse"])
+                if os.path.exists(path):
+                    self._batcher(("bm25_queries", path, SPARSE_TOKENIZER))
+
+    def serve_forever(self) -> None:
+        # 이전 실행이 남긴 소켓 파일 정리 (실행 중인 사이드카가 있으면 중단)
+        if os.path.exists(self.address):
+            try:
+                Client(self.address, family="AF_UNIX", authkey=_authkey()).close()
+            except (OSError, EOFError):
+                os.unlink(self.address)
+            else:
+                raise RuntimeError(f"이미 실행 중인 추론 사이드카가 있습니다: {self.address}")
+
+        authkey = _authkey()
+        # 소켓 파일이 처음부터 0600으로 생성되도록 umask를 잠시 제한 (bind 후 chmod하면 그 사이에 접속 가능)
+        old_umask = os.umask(0o177)
+        try:
+            # authkey 인증은 Listener.accept가 아니라 _serve_connection에서 직접 수행
+            listener = Listener(self.address, family="AF_UNIX")
+        finally:
+            os.umask(old_umask)
+
+        with listener:
+            print(f"🚀 추론 사이드카 대기 중: {self.address} (max_batch={self.max_batch}, wait={self.max_wait_ms}ms)")
+            while True:
+                try:
+                    conn = listener.accept()
+                except Exception as e:
+                    # 개별 연결 오류는 무시하고 계속 대기
+                    logger.warning(f"사이드카 연결 수락 실패: {e}")
+                    continue
+                threading.Thread(target=self._serve_connection, args=(conn, authkey), daemon=True).start()
+
+
+def main():
+    from dotenv import load_dotenv
+
+    load_dotenv()
+    parser = argparse.ArgumentParser(description="모델을 한 프로세스에서 소유하고 워커 요청을 마이크로 배치로 처리하는 추론 사이드카")
+    parser.add_argument("--socket", default=INFERENCE_SOCKET_PATH)
+    parser.add_argument("--max-batch", type=int, default=SIDECAR_MAX_BATCH)
+    parser.add_argument("--wait-ms", type=float, default=SIDECAR_BATCH_WAIT_MS)
+    parser.add_argument("--no-preload", action="store_true", help="모델을 첫 요청 시점에 로드")
+    parser.add_argument("--stats", action="store_true", help="실행 중인 사이드카의 배치 통계만 출력하고 종료")
+    args = parser.parse_args()
+
+    if args.stats:
+        print(json.dumps(SidecarClient(args.socket).call({"op": "stats"}), ensure_ascii=False, indent=2))
+        return
+
+    sidecar = InferenceSidecar(args.socket, max_batch=args.max_batch, max_wait_ms=args.wait_ms)
+    if not args.no_preload:
+        sidecar.preload()
+    try:
+        # Listener가 닫힐 때 소켓 파일도 함께 삭제됨
+        sidecar.serve_forever()
+    except KeyboardInterrupt:
+        print("🛑 추론 사이드카 종료")
+
+
+if __name__ == "__main__":
+    main()
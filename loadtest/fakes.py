@@ -0,0 +1,242 @@
+import threading
+import time
+from types import SimpleNamespace
+from typing import Any, Dict, List, Optional, Sequence
+
+import numpy as np
+
+from retriever.filters import MetadataBitmapIndex
+
+
+class LatencyModel:
+    """
+    원격 호출 지연시간 / 오류 분포 모델
+    - 지연시간: 중앙값 median_ms, 꼬리 두께 sigma의 로그정규 분포 (sigma=0이면 고정 지연)
+    - 오류: error_rate 확률로 error_factory()가 만든 예외 발생
+    - time.sleep으로 대기하므로 실제 네트워크 대기처럼 GIL을 놓고 스레드 동시성에 영향을 주지 않음
+    """
+
+    def __init__(
+        self,
+        median_ms: float = 0.0,
+        sigma: float = 0.0,
+        error_rate: float = 0.0,
+        error_factory=None,
+        seed: Optional[int] = None,
+    ):
+        self.median_ms = median_ms
+        self.sigma = sigma
+        self.error_rate = error_rate
+        self.error_factory = error_factory or (lambda: RuntimeError("[fake] 원격 호출 실패"))
+        self._rng = np.random.default_rng(seed)
+        self._lock = threading.Lock()
+
+    def wait(self) -> None:
+        with self._lock:
+            delay_ms = self.median_ms * float(np.exp(self._rng.normal(0.0, self.sigma))) if self.sigma else self.median_ms
+            failed = self.error_rate > 0 and self._rng.random() < self.error_rate
+        if delay_ms > 0:
+            time.sleep(delay_ms / 1000)
+        if failed:
+            raise self.error_factory()
+
+
+class _CallStats:
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.calls = 0
+        self.errors = 0
+
+    def record(self, error: bool) -> None:
+        with self._lock:
+            self.calls += 1
+            self.errors += int(error)
+
+
+class FakePineconeIndex:
+    """
+    retriever/, vectorstore/에서 쓰는 pc.Index(...)의 upsert / query 표면을 메모리에서 흉내 내는 인덱스
+    - upsert: dense 업로더의 (id, values, metadata) 튜플과 sparse 업로더의 {"id", "sparse_values", "metadata"} 딕셔너리 모두 허용
+    - query: vector(코사인 유사도) 또는 sparse_vector(내적)로 점수를 계산하고,
+      filter는 MetadataBitmapIndex로 평가하여 Pinecone과 같은 {"matches": [...]} 형식으로 반환
+    """
+
+    def __init__(self, latency: Optional[LatencyModel] = None):
+        self.latency = latency or LatencyModel()
+        self.stats = _CallStats()
+        self._lock = threading.Lock()
+        self._ids: List[str] = []
+        self._positions: Dict[str, int] = {}
+        self._dense: List[Optional[np.ndarray]] = []
+        self._sparse: List[Optional[Dict[int, float]]] = []
+        self._meta: List[dict] = []
+        # 질의 시 사용하는 읽기 전용 스냅샷 (upsert 후 첫 질의에서 재생성)
+        self._matrix: Optional[np.ndarray] = None
+        self._bitmap: Optional[MetadataBitmapIndex] = None
+
+    def upsert(self, vectors: Sequence[Any], **kwargs) -> Dict[str, int]:
+        self._call()
+        with self._lock:
+            for item in vectors:
+                if isinstance(item, dict):
+                    doc_id, metadata = item["id"], item.get("metadata") or {}
+                    dense, sparse = item.get("values"), item.get("sparse_values")
+                else:
+                    doc_id, dense = item[0], item[1]
+                    metadata = item[2] if len(item) > 2 else {}
+                    sparse = None
+
+                if doc_id not in self._positions:
+                    self._positions[doc_id] = len(self._ids)
+                    self._ids.append(doc_id)
+                    self._dense.append(None)
+                    self._sparse.append(None)
+                    self._meta.append({})
+                pos = self._positions[doc_id]
+                self._dense[pos] = np.asarray(dense, dtype=np.float32) if dense is not None and len(dense) else None
+                self._sparse[pos] = dict(zip(sparse["indices"], sparse["values"])) if sparse else None
+                self._meta[pos] = dict(metadata)
+            self._matrix = None
+            self._bitmap = None
+        return {"upserted_count": len(vectors)}
+
+    def _call(self) -> None:
+        try:
+            self.latency.wait()
+        except Exception:
+            self.stats.record(error=True)
+            raise
+        self.stats.record(error=False)
+
+    def _snapshot(self):
+        with self._lock:
+            if self._bitmap is None:
+                self._bitmap = MetadataBitmapIndex(dict(zip(self._ids, self._meta)))
+                dense = [v for v in self._dense if v is not None]
+                if dense and len(dense) == len(self._dense):
+                    matrix = np.vstack(dense)
+                    norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+                    self._matrix = matrix / np.where(norms == 0, 1.0, norms)
+            return self._matrix, self._bitmap, list(self._sparse)
+
+    def query(
+        self,
+        top_k: int = 10,
+        vector: Optional[Sequence[float]] = None,
+        sparse_vector: Optional[dict] = None,
+        filter: Optional[dict] = None,
+        include_metadata: bool = False,
+        **kwargs,
+    ) -> Dict[str, List[dict]]:
+        self._call()
+        matrix, bitmap, sparse_rows = self._snapshot()
+        scores = np.full(len(bitmap), -np.inf, dtype=np.float32)
+
+        if vector is not None:
+            if matrix is None:
+                raise ValueError("[fake] dense 벡터가 없는 인덱스에 vector 질의를 보냈습니다.")
+            q = np.asarray(vector, dtype=np.float32)
+            scores = matrix @ (q / (np.linalg.norm(q) or 1.0))
+        elif sparse_vector is not None:
+            q = dict(zip(sparse_vector["indices"], sparse_vector["values"]))
+            for pos, row in enumerate(sparse_rows):
+                if row:
+                    scores[pos] = sum(w * row.get(i, 0.0) for i, w in q.items())
+        else:
+            raise ValueError("[fake] vector 또는 sparse_vector가 필요합니다.")
+
+        scores = np.where(bitmap.mask(filter), scores, -np.inf)
+        k = min(top_k, int(np.isfinite(scores).sum()))
+        order = np.argsort(-scores)[:k]
+
+        matches = []
+        for pos in order:
+            match = {"id": bitmap.ids[pos], "score": float(scores[pos])}
+            if include_metadata:
+                match["metadata"] = dict(self._meta[pos])
+            matches.append(match)
+        return {"matches": matches}
+
+    def describe_index_stats(self) -> Dict[str, int]:
+        return {"total_vector_count": len(self._ids)}
+
+
+class FakePinecone:
+    """
+    pinecone.Pinecone 클라이언트 대체: 이름별 FakePineconeIndex를 보관
+    - 업로더처럼 list_indexes().names() / create_index / Index(name) 순으로 사용 가능
+    """
+
+    def __init__(self, latency: Optional[LatencyModel] = None, **kwargs):
+        self.latency = latency
+        self._indexes: Dict[str, FakePineconeIndex] = {}
+
+    def list_indexes(self):
+        names = list(self._indexes)
+        return SimpleNamespace(names=lambda: names)
+
+    def create_index(self, name: str, **kwargs) -> None:
+        self._indexes.setdefault(name, FakePineconeIndex(self.latency))
+
+    def Index(self, name: str) -> FakePineconeIndex:
+        self.create_index(name)
+        return self._indexes[name]
+
+
+def quota_exhausted_error():
+    """
+    실제 Gemini 할당량 초과와 같은 예외 타입 (google-api-core가 없으면 RuntimeError)
+    """
+    try:
+        from google.api_core.exceptions import ResourceExhausted
+        return ResourceExhausted("[fake] quota exhausted")
+    except ImportError:
+        return RuntimeError("[fake] quota exhausted")
+
+
+class FakeGenerativeModel:
+    """
+    genai.GenerativeModel(...).generate_content(prompt) 대체
+    - 지연시간은 고정 부분(latency) + 출력 길이에 비례하는 부분(ms_per_char × 응답 길이)
+    """
+
+    def __init__(self, genai: "FakeGenAI", model_name: str):
+        self.genai = genai
+        self.model_name = model_name
+
+    def generate_content(self, prompt: str):
+        genai = self.genai
+        try:
+            genai.latency.wait()
+        except Exception:
+            genai.stats.record(error=True)
+            raise
+        text = genai.response_text
+        if genai.ms_per_char > 0:
+            time.sleep(genai.ms_per_char * len(text) / 1000)
+        genai.stats.record(error=False)
+        return SimpleNamespace(text=text)
+
+
+class FakeGenAI:
+    """
+    google.generativeai 모듈 대체 (GeminiLLM(client=FakeGenAI(...))로 주입)
+    - 오류는 기본적으로 할당량 초과(ResourceExhausted)로 발생시켜 GeminiLLM의 실제 오류 경로를 탄다
+    """
+
+    def __init__(
+        self,
+        latency: Optional[LatencyModel] = None,
+        ms_per_char: float = 0.0,
+        response_text: str = "[fake] 모집 일정은 공지사항을 참고해 주세요.",
+    ):
+        self.latency = latency or LatencyModel(error_factory=quota_exhausted_error)
+        self.ms_per_char = ms_per_char
+        self.response_text = response_text
+        self.stats = _CallStats()
+
+    def configure(self, **kwargs) -> None:
+        pass
+
+    def GenerativeModel(self, model_name: str) -> FakeGenerativeModel:
+        return FakeGenerativeModel(self, model_name)
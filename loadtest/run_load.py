@@ -0,0 +1,279 @@
+import sys
+import os
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+import argparse
+import json
+import tempfile
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, List, Tuple
+
+import numpy as np
+
+try:
+    import resource  # 최대 RSS 측정용 (Windows에는 없음)
+except ImportError:
+    resource = None
+
+from config import (
+    DEFAULT_CORPUS,
+    DENSE_MODEL_NAME,
+    SPARSE_TOKENIZER,
+    TOP_K,
+    USE_EMBEDDING_CACHE,
+    USE_FAQ,
+    USE_SPARSE,
+)
+from corpus import get_corpus
+from loadtest.fakes import FakeGenAI, FakePinecone, LatencyModel, quota_exhausted_error
+
+# run_qa_chain / GeminiLLM이 실패 시 반환하는 응답 접두어 (예외 대신 문자열로 돌려주므로 접두어로 판별)
+ERROR_PREFIXES = ("[실행 실패]", "[LLM 호출 실패]", "[할당량 초과]")
+
+
+def _load_mappings(settings: Dict, use_sparse: bool, workdir: str) -> Tuple[str, str]:
+    """
+    업로더가 저장한 ID → 텍스트 / 메타데이터 매핑 경로 반환
+    - 매핑 파일이 없으면 원본 문서를 청킹하여 임시 디렉토리에 같은 형식으로 저장 (Pinecone 업로드 없이 실행 가능)
+    """
+    suffix = "sparse" if use_sparse else "dense"
+    text_path = settings[f"id_to_text_path_{suffix}"]
+    meta_path = settings[f"id_to_meta_path_{suffix}"]
+    if os.path.exists(text_path):
+        return text_path, meta_path
+
+    from preprocess import load_documents
+
+    docs = load_documents(settings["data_path"])
+    if not docs:
+        raise ValueError(f"❌ 문서가 없습니다. '{settings['data_path']}' 디렉토리를 확인하세요.")
+    text_path = os.path.join(workdir, "id_to_text.json")
+    meta_path = os.path.join(workdir, "id_to_meta.json")
+    with open(text_path, "w", encoding="utf-8") as f:
+        json.dump({str(i): doc.page_content for i, doc in enumerate(docs)}, f, ensure_ascii=False)
+    with open(meta_path, "w", encoding="utf-8") as f:
+        json.dump({str(i): doc.metadata for i, doc in enumerate(docs)}, f, ensure_ascii=False)
+    if use_sparse:
+        from retriever.korean_tokenizer import save_tokenizer_name
+
+        save_tokenizer_name(text_path, SPARSE_TOKENIZER)
+    print(f"📄 매핑 파일이 없어 문서를 직접 청킹했습니다: {len(docs)}개 청크")
+    return text_path, meta_path
+
+
+def _fill_index(index, text_path: str, meta_path: str, use_sparse: bool) -> None:
+    """
+    업로더와 같은 형식(sparse: 딕셔너리 / dense: 튜플)으로 로컬 인덱스에 벡터 적재
+    """
+    from retriever.filters import load_id_to_meta
+
+    with open(text_path, "r", encoding="utf-8") as f:
+        id_to_text = json.load(f)
+    id_to_meta = load_id_to_meta(meta_path)
+    ids, texts = list(id_to_text.keys()), list(id_to_text.values())
+
+    if use_sparse:
+        from retriever.korean_tokenizer import create_bm25_encoder
+
+        encoder = create_bm25_encoder(texts, tokenizer_name=SPARSE_TOKENIZER)
+        index.upsert(vectors=[
+            {"id": doc_id, "sparse_values": vec, "metadata": id_to_meta.get(doc_id, {})}
+            for doc_id, vec in zip(ids, encoder.encode_documents(texts))
+        ])
+    else:
+        from model_runtime import load_query_encoder
+        from vectorstore.embedding_cache import EmbeddingCache, embed_with_cache
+
+        # 문서 벡터는 업로더(SBERTEmbeddings)와 같은 fp32 SentenceTransformer로 계산
+        # - 영구 캐시는 모델 이름만으로 키를 잡으므로 INFERENCE_BACKEND / INFERENCE_MODE(int8, ONNX, 사이드카)를 따르면 캐시가 오염됨
+        encoder = load_query_encoder(DENSE_MODEL_NAME, backend="torch")
+        cache = EmbeddingCache() if USE_EMBEDDING_CACHE else None
+        vectors = embed_with_cache(texts, DENSE_MODEL_NAME, encoder.encode, cache)
+        if cache is not None:
+            cache.close()
+        index.upsert(vectors=[(doc_id, vec, id_to_meta.get(doc_id, {})) for doc_id, vec in zip(ids, vectors)])
+    print(f"✅ 로컬 인덱스 적재 완료: {len(ids)}개 벡터")
+
+
+def build_fake_chain(args, workdir: str):
+    """
+    Pinecone / Gemini만 로컬 대체 구현으로 바꾸고 나머지(인코더, rerank, FAQ, 필터)는 실제 코드로 체인 구성
+    """
+    from chain import GeminiLLM, build_qa_chain_with_rerank
+    from retriever.faq_retriever import create_faq_matcher
+
+    settings = get_corpus(args.corpus)
+    pc = FakePinecone(LatencyModel(args.pinecone_ms, args.pinecone_sigma, args.pinecone_error_rate))
+    index_name = settings["sparse_index_name" if args.sparse else "dense_index_name"]
+    index = pc.Index(index_name)
+
+    text_path, meta_path = _load_mappings(settings, args.sparse, workdir)
+    _fill_index(index, text_path, meta_path, args.sparse)
+    # 적재 이후의 호출만 집계
+    index.stats.calls = index.stats.errors = 0
+
+    if args.sparse:
+        from retriever.sparse_retriever import create_sparse_retriever
+
+        retriever = create_sparse_retriever(
+            index_name=index_name, top_k=TOP_K, id_to_text_path=text_path, id_to_meta_path=meta_path, index=index
+        )
+    else:
+        from retriever.dense_retriever import create_dense_retriever
+
+        retriever = create_dense_retriever(
+            index_name=index_name, top_k=TOP_K, id_to_text_path=text_path, id_to_meta_path=meta_path, index=index
+        )
+
+    genai = FakeGenAI(
+        LatencyModel(args.llm_ms, args.llm_sigma, args.llm_error_rate, error_factory=quota_exhausted_error),
+        ms_per_char=args.llm_ms_per_char,
+    )
+    llm = GeminiLLM(api_key="fake", client=genai)
+    faq_matcher = create_faq_matcher(settings["faq_index_path"]) if USE_FAQ and args.faq else None
+
+    chain = build_qa_chain_with_rerank(llm, retriever, top_k=3, faq_matcher=faq_matcher, corpus=settings["name"])
+    return chain, index, genai
+
+
+def load_queries(args) -> List[str]:
+    """
+    --queries 파일(한 줄에 질의 하나) → 코퍼스 CSV FAQ 질문 → 내장 샘플 질의 순으로 사용
+    """
+    if args.queries:
+        with open(args.queries, "r", encoding="utf-8") as f:
+            return [line.strip() for line in f if line.strip()]
+
+    from preprocess import load_faq_pairs
+
+    questions = [pair["question"] for pair in load_faq_pairs(get_corpus(args.corpus)["data_path"])]
+    if questions:
+        return questions
+
+    from export_models import SAMPLE_QUERIES
+    return list(SAMPLE_QUERIES)
+
+
+def _percentiles(samples: List[float]) -> str:
+    if not samples:
+        return "-"
+    ms = np.asarray(samples) * 1000
+    return " ".join(
+        f"{name}={np.percentile(ms, q):.0f}ms" for name, q in (("p50", 50), ("p95", 95), ("p99", 99))
+    ) + f" max={ms.max():.0f}ms"
+
+
+def _format_rss(max_rss_mb) -> str:
+    return f"{max_rss_mb:.0f}MB" if max_rss_mb is not None else "-"
+
+
+def run_open_loop(chain, queries: List[str], qps: float, duration_s: float, workers: int) -> Dict:
+    """
+    목표 QPS로 요청을 일정 간격 발사하는 open-loop 부하 (응답을 기다리지 않고 다음 요청을 예약)
+    - 지연시간은 예약 시각 기준으로 측정하여 작업자 대기(큐잉)까지 포함 (coordinated omission 방지)
+    """
+    from chain import run_qa_chain
+
+    lock = threading.Lock()
+    latencies: List[float] = []
+    service_times: List[float] = []
+    errors = 0
+    faq_hits = 0
+
+    def task(query: str, scheduled: float):
+        nonlocal errors, faq_hits
+        started = time.perf_counter()
+        result = run_qa_chain(chain, query)
+        finished = time.perf_counter()
+        failed = str(result.get("result", "")).startswith(ERROR_PREFIXES)
+        with lock:
+            latencies.append(finished - scheduled)
+            service_times.append(finished - started)
+            errors += int(failed)
+            faq_hits += int(bool(result.get("faq_hit")))
+
+    total = max(int(qps * duration_s), 1)
+    interval = 1.0 / qps
+    cpu_before = time.process_time()
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        for i in range(total):
+            scheduled = start + i * interval
+            delay = scheduled - time.perf_counter()
+            if delay > 0:
+                time.sleep(delay)
+            executor.submit(task, queries[i % len(queries)], scheduled)
+    wall_s = time.perf_counter() - start
+    cpu_s = time.process_time() - cpu_before
+
+    return {
+        "requests": total,
+        "errors": errors,
+        "faq_hits": faq_hits,
+        "wall_s": wall_s,
+        "throughput": len(latencies) / wall_s,
+        "latencies": latencies,
+        "service_times": service_times,
+        "cpu_s": cpu_s,
+        # Linux의 ru_maxrss 단위는 KB (resource 모듈이 없으면 None)
+        "max_rss_mb": resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024 if resource else None,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Pinecone / Gemini 로컬 대체 구현으로 run_qa_chain 부하 테스트")
+    parser.add_argument("--corpus", default=DEFAULT_CORPUS)
+    parser.add_argument("--qps", type=float, nargs="+", default=[1.0, 2.0, 5.0], help="단계별 목표 QPS")
+    parser.add_argument("--duration", type=float, default=30.0, help="단계별 지속 시간 (초)")
+    parser.add_argument("--workers", type=int, default=16, help="동시 처리 스레드 수 (Streamlit 세션 동시성 근사)")
+    parser.add_argument("--queries", help="질의 파일 (한 줄에 하나), 없으면 CSV FAQ 질문 사용")
+    parser.add_argument("--sparse", action=argparse.BooleanOptionalAction, default=USE_SPARSE)
+    # 기본 질의가 CSV FAQ 질문이므로 FAQ 고속 경로를 켜면 대부분의 요청이 Pinecone / Gemini 앞에서 끝남
+    parser.add_argument("--faq", action=argparse.BooleanOptionalAction, default=False,
+                        help="FAQ 고속 경로 사용 (기본: 끄고 매 요청 검색 + LLM 수행)")
+    parser.add_argument("--pinecone-ms", type=float, default=60.0, help="Pinecone 질의 지연 중앙값")
+    parser.add_argument("--pinecone-sigma", type=float, default=0.4, help="Pinecone 지연 로그정규 sigma (꼬리 두께)")
+    parser.add_argument("--pinecone-error-rate", type=float, default=0.0)
+    parser.add_argument("--llm-ms", type=float, default=800.0, help="Gemini 첫 토큰까지 지연 중앙값")
+    parser.add_argument("--llm-sigma", type=float, default=0.5)
+    parser.add_argument("--llm-ms-per-char", type=float, default=2.0, help="응답 길이에 비례하는 생성 시간")
+    parser.add_argument("--llm-error-rate", type=float, default=0.0, help="할당량 초과(ResourceExhausted) 발생 비율")
+    args = parser.parse_args()
+
+    from metrics import corpus_metrics
+
+    with tempfile.TemporaryDirectory() as workdir:
+        chain, index, genai = build_fake_chain(args, workdir)
+        queries = load_queries(args)
+        print(
+            f"🧪 부하 테스트: 코퍼스 '{args.corpus}', {'sparse' if args.sparse else 'dense'}, 질의 {len(queries)}개, "
+            f"FAQ 고속 경로 {'켜짐' if args.faq else '꺼짐'}"
+        )
+
+        # 워밍업 (모델 로딩 / 토크나이저 캐시 채우기는 측정에서 제외)
+        from chain import run_qa_chain
+        run_qa_chain(chain, queries[0])
+        corpus_metrics.reset()
+
+        for qps in args.qps:
+            index.stats.calls = index.stats.errors = genai.stats.calls = genai.stats.errors = 0
+            report = run_open_loop(chain, queries, qps, args.duration, args.workers)
+            print(
+                f"📊 [목표 {qps:g} QPS] 처리량 {report['throughput']:.2f} req/s "
+                f"({report['requests']}건 / {report['wall_s']:.1f}s), 오류 {report['errors']}건, "
+                f"FAQ 응답 {report['faq_hits'] / report['requests']:.0%}\n"
+                f"   지연(큐잉 포함) {_percentiles(report['latencies'])}\n"
+                f"   처리 시간      {_percentiles(report['service_times'])}\n"
+                f"   CPU {report['cpu_s']:.1f}s (평균 {report['cpu_s'] / report['wall_s']:.2f} 코어), "
+                f"최대 RSS {_format_rss(report['max_rss_mb'])}\n"
+                f"   Pinecone 호출 {index.stats.calls}회 (오류 {index.stats.errors}), "
+                f"Gemini 호출 {genai.stats.calls}회 (오류 {genai.stats.errors})"
+            )
+
+        print(f"📈 코퍼스 메트릭: {corpus_metrics.snapshot()}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,52 @@
+import threading
+from collections import defaultdict, deque
+from typing import Any, Deque, Dict
+
+import numpy as np
+
+# 코퍼스별로 보관할 최근 지연시간 샘플 수
+LATENCY_WINDOW = 1000
+
+
+class CorpusMetrics:
+    """
+    코퍼스(테넌트)별 요청 수 / FAQ 적중 / 오류 / 지연시간을 집계하는 스레드 안전 레지스트리
+    - 프로세스 내 메모리에만 보관 (최근 LATENCY_WINDOW개 지연시간 샘플)
+    """
+
+    def __init__(self, window: int = LATENCY_WINDOW):
+        self._lock = threading.Lock()
+        self._counters: Dict[str, Dict[str, int]] = defaultdict(lambda: defaultdict(int))
+        self._latencies: Dict[str, Deque[float]] = defaultdict(lambda: deque(maxlen=window))
+
+    def record_request(self, corpus: str, latency_s: float, faq_hit: bool = False, error: bool = False) -> None:
+        with self._lock:
+            counters = self._counters[corpus]
+            counters["requests"] += 1
+            counters["faq_hits"] += int(faq_hit)
+            counters["errors"] += int(error)
+            self._latencies[corpus].append(latency_s)
+
+    def snapshot(self) -> Dict[str, Dict[str, Any]]:
+        """
+        코퍼스별 집계 결과 반환 (p50/p95 지연시간은 최근 샘플 기준, 초 단위)
+        """
+        with self._lock:
+            result = {}
+            for corpus, counters in self._counters.items():
+                latencies = list(self._latencies[corpus])
+                result[corpus] = {
+                    **counters,
+                    "p50_s": float(np.percentile(latencies, 50)) if latencies else None,
+                    "p95_s": float(np.percentile(latencies, 95)) if latencies else None,
+                }
+            return result
+
+    def reset(self) -> None:
+        with self._lock:
+            self._counters.clear()
+            self._latencies.clear()
+
+
+# 프로세스 전역 메트릭 레지스트리
+corpus_metrics = CorpusMetrics()
@@ -0,0 +1,240 @@
+import os
+import json
+import logging
+from functools import lru_cache
+from typing import Any, Dict, List, Sequence, Tuple
+
+import numpy as np
+
+from config import (
+    CROSS_ENCODER_MODEL_NAME,
+    DENSE_MODEL_NAME,
+    INFERENCE_BACKEND,
+    INFERENCE_MODE,
+    INFERENCE_NUM_THREADS,
+    ONNX_MODEL_DIR,
+)
+
+# 로그 설정
+logger = logging.getLogger(__name__)
+logger.setLevel(logging.INFO)
+
+BACKENDS = ("torch", "torch_int8", "onnx", "onnx_int8")
+
+# ONNX export 디렉토리 내 파일명
+ONNX_FP32_FILE = "model.onnx"
+ONNX_INT8_FILE = "model_int8.onnx"
+RUNTIME_CONFIG_FILE = "runtime_config.json"
+
+
+def onnx_model_dir(model_name: str, onnx_dir: str = ONNX_MODEL_DIR) -> str:
+    """
+    모델 이름(예: "jhgan/ko-sbert-sts")에 대응하는 ONNX export 디렉토리 경로
+    """
+    return os.path.join(onnx_dir, model_name.replace("/", "__"))
+
+
+def _set_torch_threads(num_threads: int) -> None:
+    import torch
+
+    if num_threads > 0:
+        torch.set_num_threads(num_threads)
+
+
+def _create_onnx_session(model_path: str, num_threads: int):
+    """
+    CPU 전용 ONNX Runtime 세션 생성 (스레드 수 및 그래프 최적화 설정)
+    """
+    import onnxruntime as ort
+
+    if not os.path.exists(model_path):
+        raise FileNotFoundError(
+            f"ONNX 모델을 찾을 수 없습니다: {model_path} (python export_models.py 로 먼저 생성하세요)"
+        )
+
+    options = ort.SessionOptions()
+    options.graph_optimization_level = ort.GraphOptimizationLevel.ORT_ENABLE_ALL
+    if num_threads > 0:
+        options.intra_op_num_threads = num_threads
+        options.inter_op_num_threads = 1
+    return ort.InferenceSession(model_path, sess_options=options, providers=["CPUExecutionProvider"])
+
+
+def _onnx_inputs(session: Any, encoded: Dict[str, np.ndarray]) -> Dict[str, np.ndarray]:
+    """
+    토크나이저 출력 중 ONNX 그래프가 실제로 받는 입력만 int64로 골라 전달
+    """
+    names = {inp.name for inp in session.get_inputs()}
+    return {k: v.astype(np.int64) for k, v in encoded.items() if k in names}
+
+
+class QueryEncoder:
+    """
+    SBERT(mean pooling) 문장 임베딩 인코더
+    - torch / torch_int8: SentenceTransformer 기반
+    - onnx / onnx_int8: export된 트랜스포머 + numpy mean pooling
+    """
+
+    def __init__(self, model_name: str = DENSE_MODEL_NAME, backend: str = INFERENCE_BACKEND,
+                 num_threads: int = INFERENCE_NUM_THREADS, batch_size: int = 32):
+        if backend not in BACKENDS:
+            raise ValueError(f"지원하지 않는 추론 백엔드입니다: {backend} (가능: {BACKENDS})")
+        self.model_name = model_name
+        self.backend = backend
+        self.batch_size = batch_size
+
+        if backend.startswith("torch"):
+            import torch
+            from sentence_transformers import SentenceTransformer
+
+            _set_torch_threads(num_threads)
+            model = SentenceTransformer(model_name, device="cpu")
+            if backend == "torch_int8":
+                model = torch.quantization.quantize_dynamic(model, {torch.nn.Linear}, dtype=torch.qint8)
+            self.model = model
+        else:
+            from transformers import AutoTokenizer
+
+            export_dir = onnx_model_dir(model_name)
+            with open(os.path.join(export_dir, RUNTIME_CONFIG_FILE), "r", encoding="utf-8") as f:
+                self.max_length = json.load(f)["max_length"]
+            self.tokenizer = AutoTokenizer.from_pretrained(export_dir)
+            model_file = ONNX_INT8_FILE if backend == "onnx_int8" else ONNX_FP32_FILE
+            self.session = _create_onnx_session(os.path.join(export_dir, model_file), num_threads)
+
+    def encode(self, texts: Sequence[str], normalize: bool = False) -> np.ndarray:
+        """
+        문장 리스트를 (N, dim) float32 임베딩 배열로 변환
+        """
+        texts = list(texts)
+        if self.backend.startswith("torch"):
+            vectors = self.model.encode(
+                texts, batch_size=self.batch_size, show_progress_bar=False, normalize_embeddings=normalize
+            )
+            return np.asarray(vectors, dtype=np.float32)
+
+        chunks = []
+        for start in range(0, len(texts), self.batch_size):
+            batch = texts[start:start + self.batch_size]
+            encoded = self.tokenizer(
+                batch, padding=True, truncation=True, max_length=self.max_length, return_tensors="np"
+            )
+            hidden = self.session.run(None, _onnx_inputs(self.session, encoded))[0]
+            mask = encoded["attention_mask"][..., None].astype(np.float32)
+            pooled = (hidden * mask).sum(axis=1) / np.clip(mask.sum(axis=1), 1e-9, None)
+            chunks.append(pooled.astype(np.float32))
+        vectors = np.concatenate(chunks, axis=0) if chunks else np.zeros((0, 0), dtype=np.float32)
+
+        if normalize and len(vectors):
+            vectors = vectors / np.clip(np.linalg.norm(vectors, axis=1, keepdims=True), 1e-12, None)
+        return vectors
+
+
+class CrossEncoderScorer:
+    """
+    (질의, 문서) 쌍의 relevance 점수를 계산하는 Cross-Encoder
+    - torch / torch_int8: transformers AutoModelForSequenceClassification
+    - onnx / onnx_int8: export된 ONNX 그래프를 ONNX Runtime으로 실행
+    """
+
+    def __init__(self, model_name: str = CROSS_ENCODER_MODEL_NAME, backend: str = INFERENCE_BACKEND,
+                 num_threads: int = INFERENCE_NUM_THREADS):
+        if backend not in BACKENDS:
+            raise ValueError(f"지원하지 않는 추론 백엔드입니다: {backend} (가능: {BACKENDS})")
+        self.model_name = model_name
+        self.backend = backend
+
+        from transformers import AutoTokenizer
+
+        if backend.startswith("torch"):
+            import torch
+            from transformers import AutoModelForSequenceClassification
+
+            _set_torch_threads(num_threads)
+            self.tokenizer = AutoTokenizer.from_pretrained(model_name)
+            model = AutoModelForSequenceClassification.from_pretrained(model_name)
+            model.eval()
+            if backend == "torch_int8":
+                model = torch.quantization.quantize_dynamic(model, {torch.nn.Linear}, dtype=torch.qint8)
+            self.model = model
+        else:
+            export_dir = onnx_model_dir(model_name)
+            self.tokenizer = AutoTokenizer.from_pretrained(export_dir)
+            model_file = ONNX_INT8_FILE if backend == "onnx_int8" else ONNX_FP32_FILE
+            self.session = _create_onnx_session(os.path.join(export_dir, model_file), num_threads)
+
+    def score_pairs(self, pairs: List[Tuple[str, str]]) -> List[float]:
+        """
+        (text_a, text_b) 쌍 리스트의 relevance logit을 한 번의 배치로 계산
+        """
+        if not pairs:
+            return []
+
+        if self.backend.startswith("torch"):
+            import torch
+
+            inputs = self.tokenizer.batch_encode_plus(pairs, return_tensors="pt", truncation=True, padding=True)
+            with torch.no_grad():
+                logits = self.model(**inputs).logits
+            return logits[:, 0].tolist()
+
+        encoded = self.tokenizer.batch_encode_plus(pairs, return_tensors="np", truncation=True, padding=True)
+        logits = self.session.run(None, _onnx_inputs(self.session, dict(encoded)))[0]
+        return logits[:, 0].astype(np.float32).tolist()
+
+    def score(self, query: str, texts: Sequence[str]) -> List[float]:
+        """
+        하나의 질의와 여러 문서 텍스트 간 relevance 점수 계산
+        """
+        return self.score_pairs([(query, text) for text in texts])
+
+
+def loaded_models() -> Dict[str, int]:
+    """
+    이 프로세스의 공유 모델 풀에 로드된 모델 수 (코퍼스 수와 무관하게 (모델명, 백엔드) 조합 수만큼만 증가)
+    - sidecar 모드의 워커는 모델을 로드하지 않으므로 0
+    """
+    return {
+        "query_encoders": load_query_encoder.cache_info().currsize,
+        "cross_encoders": load_cross_encoder.cache_info().currsize,
+    }
+
+
+@lru_cache(maxsize=None)
+def load_query_encoder(model_name: str = DENSE_MODEL_NAME, backend: str = INFERENCE_BACKEND) -> QueryEncoder:
+    """
+    프로세스 내에서 (모델명, 백엔드)별로 한 번만 로드되는 쿼리 인코더
+    """
+    logger.info(f"쿼리 인코더 로드: {model_name} ({backend})")
+    return QueryEncoder(model_name=model_name, backend=backend)
+
+
+@lru_cache(maxsize=None)
+def load_cross_encoder(model_name: str = CROSS_ENCODER_MODEL_NAME, backend: str = INFERENCE_BACKEND) -> CrossEncoderScorer:
+    """
+    프로세스 내에서 (모델명, 백엔드)별로 한 번만 로드되는 Cross-Encoder
+    """
+    logger.info(f"Cross-Encoder 로드: {model_name} ({backend})")
+    return CrossEncoderScorer(model_name=model_name, backend=backend)
+
+
+def get_query_encoder(model_name: str = DENSE_MODEL_NAME, backend: str = INFERENCE_BACKEND):
+    """
+    config.INFERENCE_MODE에 따라 로컬 쿼리 인코더 또는 사이드카 클라이언트 반환 (encode 인터페이스 동일)
+    """
+    if INFERENCE_MODE == "sidecar":
+        from inference_sidecar import RemoteQueryEncoder
+
+        return RemoteQueryEncoder(model_name=model_name, backend=backend)
+    return load_query_encoder(model_name, backend)
+
+
+def get_cross_encoder(model_name: str = CROSS_ENCODER_MODEL_NAME, backend: str = INFERENCE_BACKEND):
+    """
+    config.INFERENCE_MODE에 따라 로컬 Cross-Encoder 또는 사이드카 클라이언트 반환 (score / score_pairs 인터페이스 동일)
+    """
+    if INFERENCE_MODE == "sidecar":
+        from inference_sidecar import RemoteCrossEncoder
+
+        return RemoteCrossEncoder(model_name=model_name, backend=backend)
+    return load_cross_encoder(model_name, backend)
@@ -1,34 +1,105 @@
 import os
+import re
 import pandas as pd
-from typing import List
+from typing import Any, Dict, List, Optional
 from langchain.schema import Document
 from langchain_community.document_loaders import PyPDFLoader
-from langchain.text_splitter import RecursiveCharacterTextSplitter
 
 from config import DATA_PATH
+from chunking import get_chunker
 
-def load_documents() -> List[Document]:
+# 파일명/컬럼에서 연도·기수를 추출하는 패턴
+YEAR_PATTERN = re.compile(r"(20\d{2})")
+COHORT_PATTERN = re.compile(r"(\d{1,2})\s*기")
+
+# 연도/기수 값으로 인식할 CSV 컬럼명 후보 (소문자 비교)
+YEAR_COLUMNS = ["연도", "년도", "year"]
+COHORT_COLUMNS = ["기수", "cohort"]
+
+# 파일명 키워드 → 문서 유형 (앞에서부터 우선 적용, 일치하지 않으면 "general")
+DOC_TYPE_KEYWORDS = {
+    "faq": ["faq", "qna", "질문", "문의"],
+    "recruit": ["모집", "지원", "recruit", "면접"],
+    "curriculum": ["커리큘럼", "세션", "curriculum", "session"],
+    "project": ["프로젝트", "컨퍼런스", "project", "conference"],
+}
+
+
+def extract_file_metadata(fname: str) -> Dict[str, Any]:
+    """
+    파일명에서 연도(year), 기수(cohort), 문서 유형(doc_type)을 추출합니다.
+    - 값을 찾지 못한 연도/기수는 포함하지 않고, has_year로 연도 존재 여부를 기록 (Pinecone 필터용)
+    """
+    lowered = fname.lower()
+    metadata: Dict[str, Any] = {
+        "file_type": os.path.splitext(lowered)[1].lstrip("."),
+        "doc_type": "general",
+    }
+    for doc_type, keywords in DOC_TYPE_KEYWORDS.items():
+        if any(keyword in lowered for keyword in keywords):
+            metadata["doc_type"] = doc_type
+            break
+
+    year = YEAR_PATTERN.search(fname)
+    if year:
+        metadata["year"] = int(year.group(1))
+    cohort = COHORT_PATTERN.search(fname)
+    if cohort:
+        metadata["cohort"] = int(cohort.group(1))
+    metadata["has_year"] = "year" in metadata
+    return metadata
+
+
+def _to_int(value: Any) -> Optional[int]:
+    """
+    "2024", 2024.0, "22기" 같은 값에서 정수를 추출 (실패 시 None)
     """
-    data/ 폴더 내의 PDF 및 CSV 파일을 로드하고,
+    if pd.isna(value):
+        return None
+    match = re.search(r"\d+", str(value))
+    return int(match.group(0)) if match else None
+
+
+def extract_row_metadata(row: Any, columns: List[str]) -> Dict[str, Any]:
+    """
+    CSV 행의 연도/기수 컬럼 값을 메타데이터로 추출합니다. (파일명에서 얻은 값보다 우선)
+    """
+    metadata: Dict[str, Any] = {}
+    year_col = _find_column(columns, YEAR_COLUMNS)
+    if year_col is not None:
+        year = _to_int(row[year_col])
+        if year:
+            metadata["year"] = year
+            metadata["has_year"] = True
+    cohort_col = _find_column(columns, COHORT_COLUMNS)
+    if cohort_col is not None:
+        cohort = _to_int(row[cohort_col])
+        if cohort:
+            metadata["cohort"] = cohort
+    return metadata
+
+
+def load_documents(data_path: str = DATA_PATH, chunker: Any = None) -> List[Document]:
+    """
+    data/ 폴더(코퍼스별 data_path) 내의 PDF 및 CSV 파일을 로드하고,
     텍스트를 chunk 단위로 분할하여 LangChain Document 리스트로 반환합니다.
-    각 Document에는 출처 정보 및 청크 인덱스가 metadata로 포함됩니다.
+    각 Document에는 출처 정보 및 청크 인덱스, PDF의 경우 페이지 범위(page / page_end)와 함께
+    연도(year) / 기수(cohort) / 문서 유형(doc_type) 등 필터링용 구조화 메타데이터가 포함됩니다.
+    - chunker: chunking 모듈의 청커 (없으면 config.CHUNK_STRATEGY 사용)
     """
     all_docs: List[Document] = []
 
     # 텍스트 청킹 전략 정의
-    text_splitter = RecursiveCharacterTextSplitter(
-        chunk_size=500,             # 청크 최대 길이
-        chunk_overlap=100,          # 청크 간 중첩 길이
-        length_function=len,        # 기본 길이 측정 함수
-        separators=["\n\n", "\n", " ", ""]  # 청크 구분자 우선순위
-    )
+    text_splitter = chunker if chunker is not None else get_chunker()
 
     # data/ 폴더 내 파일 순회
-    for fname in os.listdir(DATA_PATH):
-        path = os.path.join(DATA_PATH, fname)
+    for fname in os.listdir(data_path):
+        path = os.path.join(data_path, fname)
         if not os.path.isfile(path):
             continue
 
+        file_meta = extract_file_metadata(fname)
+
         # PDF 파일 처리
         if fname.lower().endswith(".pdf"):
             try:
@@ -38,13 +109,15 @@ def load_documents() -> List[Document]:
                 print(f"[❌ PDF 로딩 실패] {fname}: {e}")
                 continue
 
-            # 전체 페이지를 이어붙인 후 청크 단위로 분할
-            full_text = "\n".join([doc.page_content for doc in raw_docs])
-            chunks = text_splitter.split_text(full_text)
-            for idx, chunk in enumerate(chunks):
+            # 페이지 번호(1부터)를 유지한 채 청크 단위로 분할
+            pages = [(doc.metadata.get("page", i) + 1, doc.page_content) for i, doc in enumerate(raw_docs)]
+            chunks = text_splitter.split_pages(pages)
+            for idx, (chunk, chunk_meta) in enumerate(chunks):
                 metadata = {
                     "source": fname,
-                    "chunk_index": idx  # 몇 번째 청크인지 기록
+                    "chunk_index": idx,  # 몇 번째 청크인지 기록
+                    **chunk_meta,        # page / page_end / section
+                    **file_meta,
                 }
                 all_docs.append(Document(page_content=chunk, metadata=metadata))
 
@@ -56,15 +129,23 @@ def load_documents() -> List[Document]:
                 print(f"[❌ CSV 로딩 실패] {fname}: {e}")
                 continue
 
+            # 질문/답변 컬럼을 가진 CSV는 FAQ 유형으로 분류
+            columns = list(df.columns)
+            csv_meta = dict(file_meta)
+            if _find_column(columns, FAQ_QUESTION_COLUMNS) and _find_column(columns, FAQ_ANSWER_COLUMNS):
+                csv_meta["doc_type"] = "faq"
+
             for idx, row in df.iterrows():
                 # 한 행을 "컬럼명: 값" 형식으로 합쳐 하나의 문자열로 변환
                 combined = " | ".join(f"{col}: {row[col]}" for col in df.columns)
                 chunks = text_splitter.split_text(combined)
+                row_meta = {**csv_meta, **extract_row_metadata(row, columns)}
                 for chunk_idx, chunk in enumerate(chunks):
                     metadata = {
                         "source": fname,
-                        "row_index": idx,        # 원본 row 위치
-                        "chunk_index": chunk_idx  # 해당 row 내 청크 순번
+                        "row_index": int(idx),   # 원본 row 위치
+                        "chunk_index": chunk_idx,  # 해당 row 내 청크 순번
+                        **row_meta,
                     }
                     all_docs.append(Document(page_content=chunk, metadata=metadata))
 
@@ -74,3 +155,65 @@ def load_documents() -> List[Document]:
 
     print(f"✅ 문서 로딩 완료: 총 {len(all_docs)}개 문서 생성됨.")
     return all_docs
+
+
+# FAQ 질문/답변 컬럼으로 인식할 이름 후보 (소문자 비교)
+FAQ_QUESTION_COLUMNS = ["질문", "question", "q", "문의", "문의사항"]
+FAQ_ANSWER_COLUMNS = ["답변", "answer", "a", "응답", "답"]
+
+
+def _find_column(columns: List[str], candidates: List[str]) -> Optional[str]:
+    """
+    컬럼명 목록에서 후보 이름과 일치하는 첫 번째 컬럼을 반환합니다. (없으면 None)
+    """
+    normalized = {str(col).strip().lower(): col for col in columns}
+    for name in candidates:
+        if name in normalized:
+            return normalized[name]
+    return None
+
+
+def load_faq_pairs(data_path: str = DATA_PATH) -> List[Dict[str, Any]]:
+    """
+    data/ 폴더(코퍼스별 data_path) 내 CSV 파일 중 질문/답변 컬럼을 가진 파일에서 FAQ 쌍을 추출합니다.
+    각 항목은 question, answer, source, row_index 키를 가진 딕셔너리이며,
+    파일명/행에서 연도·기수를 찾으면 year / cohort 키도 포함합니다. (같은 질문이 여러 기수에 있을 때 최신 항목 우선용)
+    """
+    pairs: List[Dict[str, Any]] = []
+
+    for fname in os.listdir(data_path):
+        path = os.path.join(data_path, fname)
+        if not os.path.isfile(path) or not fname.lower().endswith(".csv"):
+            continue
+
+        try:
+            df = pd.read_csv(path, encoding="utf-8-sig")
+        except Exception as e:
+            print(f"[❌ CSV 로딩 실패] {fname}: {e}")
+            continue
+
+        q_col = _find_column(list(df.columns), FAQ_QUESTION_COLUMNS)
+        a_col = _find_column(list(df.columns), FAQ_ANSWER_COLUMNS)
+        if q_col is None or a_col is None:
+            continue  # Q/A 형식이 아닌 CSV는 건너뜀
+        file_meta = extract_file_metadata(fname)
+
+        for idx, row in df.iterrows():
+            question, answer = row[q_col], row[a_col]
+            if pd.isna(question) or pd.isna(answer):
+                continue
+            question, answer = str(question).strip(), str(answer).strip()
+            if not question or not answer:
+                continue
+            pair = {
+                "question": question,
+                "answer": answer,
+                "source": fname,
+                "row_index": int(idx),
+            }
+            row_meta = {**file_meta, **extract_row_metadata(row, list(df.columns))}
+            pair.update({key: row_meta[key] for key in ("year", "cohort") if key in row_meta})
+            pairs.append(pair)
+
+    print(f"✅ FAQ 추출 완료: 총 {len(pairs)}개 질문/답변 쌍")
+    return pairs
@@ -0,0 +1,229 @@
+import os
+import sys
+import json
+import time
+import shutil
+import logging
+import threading
+import contextvars
+from collections import Counter
+from contextlib import contextmanager
+from datetime import datetime
+from typing import Any, Callable, Dict, List, Optional
+
+from config import PROFILE_DIR, PROFILE_ENV, PROFILE_MAX_RUNS, PROFILE_SAMPLE_INTERVAL_MS, PROFILE_URL_ENV
+
+logger = logging.getLogger(__name__)
+logger.setLevel(logging.INFO)
+
+# 단계 종류: "compute"(이 프로세스의 연산) | "network"(Pinecone / Gemini / 추론 사이드카 응답 대기)
+STAGE_KINDS = ("compute", "network")
+
+# 현재 요청의 프로파일 (프로파일링 중이 아니면 None → stage()는 아무것도 하지 않음)
+_active: "contextvars.ContextVar[Optional[RequestProfile]]" = contextvars.ContextVar("request_profile", default=None)
+
+
+def profiling_enabled() -> bool:
+    """
+    환경 변수(config.PROFILE_ENV)로 모든 요청의 프로파일링을 켰는지 여부
+    """
+    return os.getenv(PROFILE_ENV, "").lower() in ("1", "true", "yes")
+
+
+def url_profiling_allowed() -> bool:
+    """
+    앱 URL의 ?profile=1 요청을 받아들일지 여부 (운영자가 환경 변수 config.PROFILE_URL_ENV로 허용한 경우만)
+    """
+    return os.getenv(PROFILE_URL_ENV, "").lower() in ("1", "true", "yes")
+
+
+def prune_profiles(output_dir: str = PROFILE_DIR, max_runs: int = PROFILE_MAX_RUNS) -> None:
+    """
+    output_dir의 요청별 프로파일 폴더를 최신 max_runs개만 남기고 삭제 (폴더 이름이 시각으로 시작하므로 이름순 = 시간순)
+    """
+    runs = sorted(entry for entry in os.listdir(output_dir) if os.path.isdir(os.path.join(output_dir, entry)))
+    for entry in runs[:max(len(runs) - max_runs, 0)]:
+        shutil.rmtree(os.path.join(output_dir, entry), ignore_errors=True)
+
+
+class StackSampler:
+    """
+    대상 스레드의 파이썬 스택을 일정 간격으로 샘플링하여 collapsed stack 형식으로 집계
+    - 각 스택의 루트에 샘플 시점의 단계 이름을 붙여 플레임 그래프에서 단계별로 나뉘어 보이도록 함
+    - 외부 의존성 없이 sys._current_frames()만 사용 (speedscope, flamegraph.pl로 시각화 가능)
+    """
+
+    def __init__(self, thread_id: int, interval_s: float, label_fn: Callable[[], str]):
+        self.thread_id = thread_id
+        self.interval_s = interval_s
+        self.label_fn = label_fn
+        self.counts: Counter = Counter()
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, daemon=True)
+
+    def start(self) -> None:
+        self._thread.start()
+
+    def stop(self) -> None:
+        self._stop.set()
+        self._thread.join()
+
+    def _run(self) -> None:
+        while not self._stop.wait(self.interval_s):
+            frame = sys._current_frames().get(self.thread_id)
+            frames = []
+            while frame is not None:
+                code = frame.f_code
+                frames.append(f"{code.co_name} ({os.path.basename(code.co_filename)})")
+                frame = frame.f_back
+            if frames:
+                self.counts[";".join([f"[{self.label_fn()}]"] + frames[::-1])] += 1
+
+
+class RequestProfile:
+    """
+    한 요청의 단계별 시간 기록
+    - 단계마다 wall 시간, 하위 단계를 뺀 self 시간, 이 스레드의 CPU 시간(thread_time)을 기록
+    - torch / ONNX Runtime의 내부 스레드 연산은 thread_time에 잡히지 않으므로 연산 시간은 self 시간 기준으로 판단
+    """
+
+    def __init__(self, name: str):
+        self.name = name
+        self.meta: Dict[str, Any] = {}
+        self.stages: List[Dict[str, Any]] = []
+        self.report: Dict[str, Any] = {}
+        self.output_dir: Optional[str] = None
+        self._open: List[Dict[str, Any]] = []
+        self._start = time.perf_counter()
+
+    def current_stage(self) -> str:
+        open_stages = self._open
+        return open_stages[-1]["name"] if open_stages else self.name
+
+    @contextmanager
+    def stage(self, name: str, kind: str = "compute"):
+        if kind not in STAGE_KINDS:
+            raise ValueError(f"지원하지 않는 단계 종류입니다: {kind} (가능: {STAGE_KINDS})")
+        record = {
+            "name": name,
+            "kind": kind,
+            "depth": len(self._open),
+            "start_ms": (time.perf_counter() - self._start) * 1000,
+            "_child_ms": 0.0,
+        }
+        self._open.append(record)
+        t0, c0 = time.perf_counter(), time.thread_time()
+        try:
+            yield
+        finally:
+            record["wall_ms"] = (time.perf_counter() - t0) * 1000
+            record["cpu_ms"] = (time.thread_time() - c0) * 1000
+            record["self_ms"] = record["wall_ms"] - record.pop("_child_ms")
+            self._open.pop()
+            if self._open:
+                self._open[-1]["_child_ms"] += record["wall_ms"]
+            self.stages.append(record)
+
+    def finish(self) -> Dict[str, Any]:
+        """
+        전체 시간을 네트워크 대기와 연산으로 나누고 단계 이름별로 합산한 요약 생성
+        """
+        wall_ms = (time.perf_counter() - self._start) * 1000
+        stages = sorted(self.stages, key=lambda s: s["start_ms"])
+        network_ms = sum(s["self_ms"] for s in stages if s["kind"] == "network")
+
+        by_name: Dict[str, Dict[str, Any]] = {}
+        for s in stages:
+            agg = by_name.setdefault(s["name"], {"kind": s["kind"], "calls": 0, "wall_ms": 0.0, "self_ms": 0.0})
+            agg["calls"] += 1
+            agg["wall_ms"] += s["wall_ms"]
+            agg["self_ms"] += s["self_ms"]
+
+        self.stages = stages
+        self.report = {
+            "name": self.name,
+            "meta": self.meta,
+            "wall_ms": round(wall_ms, 2),
+            "network_ms": round(network_ms, 2),
+            "compute_ms": round(wall_ms - network_ms, 2),
+            "by_stage": {
+                name: {**agg, "wall_ms": round(agg["wall_ms"], 2), "self_ms": round(agg["self_ms"], 2)}
+                for name, agg in sorted(by_name.items(), key=lambda x: -x[1]["self_ms"])
+            },
+        }
+        return self.report
+
+    def write(self, output_dir: str = PROFILE_DIR, stack_counts: Optional[Counter] = None) -> str:
+        """
+        stages.json(요약 + 단계 타임라인), summary.txt(사람이 읽는 표), stacks.collapsed(플레임 그래프 입력) 저장
+        """
+        path = os.path.join(output_dir, f"{datetime.now():%Y%m%d-%H%M%S-%f}_{self.name}")
+        os.makedirs(path, exist_ok=True)
+
+        with open(os.path.join(path, "stages.json"), "w", encoding="utf-8") as f:
+            json.dump({**self.report, "stages": self.stages}, f, ensure_ascii=False, indent=2)
+
+        lines = [
+            f"wall {self.report['wall_ms']:.1f}ms = 연산 {self.report['compute_ms']:.1f}ms + "
+            f"네트워크 대기 {self.report['network_ms']:.1f}ms",
+            "",
+            f"{'stage':<40} {'kind':<8} {'start':>9} {'wall':>9} {'self':>9} {'cpu':>9}",
+        ]
+        for s in self.stages:
+            name = "  " * s["depth"] + s["name"]
+            lines.append(
+                f"{name:<40} {s['kind']:<8} {s['start_ms']:>7.1f}ms {s['wall_ms']:>7.1f}ms "
+                f"{s['self_ms']:>7.1f}ms {s['cpu_ms']:>7.1f}ms"
+            )
+        with open(os.path.join(path, "summary.txt"), "w", encoding="utf-8") as f:
+            f.write("\n".join(lines) + "\n")
+
+        if stack_counts:
+            with open(os.path.join(path, "stacks.collapsed"), "w", encoding="utf-8") as f:
+                for stack, count in stack_counts.most_common():
+                    f.write(f"{stack} {count}\n")
+
+        self.output_dir = path
+        prune_profiles(output_dir)
+        return path
+
+
+@contextmanager
+def stage(name: str, kind: str = "compute"):
+    """
+    현재 요청이 프로파일링 중일 때만 단계 시간을 기록 (아니면 오버헤드 없이 통과)
+    - 네트워크 호출(Pinecone 질의, Gemini 생성, 사이드카 요청)은 kind="network"로 감싸 연산과 분리
+    """
+    profile = _active.get()
+    if profile is None:
+        yield
+        return
+    with profile.stage(name, kind):
+        yield
+
+
+@contextmanager
+def profile_request(
+    name: str = "qa",
+    output_dir: str = PROFILE_DIR,
+    interval_ms: float = PROFILE_SAMPLE_INTERVAL_MS
+):
+    """
+    with 블록 안의 한 요청에 대해 단계별 시간 + 샘플링 CPU 프로파일을 수집하고 종료 시 디스크에 저장
+    - 저장 경로와 요약은 블록 종료 후 profile.output_dir / profile.report로 확인
+    - 저장 실패(디스크 오류 등)는 경고만 남기고 요청 결과나 원래 예외를 가리지 않음 (이때 output_dir은 None)
+    """
+    profile = RequestProfile(name)
+    token = _active.set(profile)
+    sampler = StackSampler(threading.get_ident(), interval_ms / 1000, profile.current_stage)
+    sampler.start()
+    try:
+        yield profile
+    finally:
+        sampler.stop()
+        _active.reset(token)
+        profile.finish()
+        try:
+            profile.write(output_dir, sampler.counts)
+        except Exception as e:
+            logger.warning(f"프로파일 저장 실패 ({output_dir}): {e}")
@@ -1,12 +1,21 @@
 import os
 import json
-from typing import Any, List
+from typing import Any, List, Optional
 from dotenv import load_dotenv
-from pinecone import Pinecone as PineconeClient
 from langchain.schema import Document, BaseRetriever
-from sentence_transformers import SentenceTransformer
 
-from config import DENSE_INDEX_NAME, DENSE_MODEL_NAME, TOP_K, ID_TO_TEXT_PATH_DENSE
+from config import (
+    DENSE_INDEX_NAME,
+    DENSE_MODEL_NAME,
+    TOP_K,
+    FILTERED_TOP_K,
+    RECENCY_YEARS,
+    RECENCY_MIN_MATCHES,
+    ID_TO_TEXT_PATH_DENSE,
+    ID_TO_META_PATH_DENSE,
+)
+from profiling import stage
+from retriever.filters import MetadataBitmapIndex, build_query_filter, load_id_to_meta
 
 # .env 파일에서 환경변수 로드 (PINECONE_API_KEY, ENV 등)
 load_dotenv()
@@ -15,21 +24,24 @@ load_dotenv()
 class SBERTEmbeddings:
     """
     단일 쿼리를 SBERT 벡터로 변환하는 임베딩 래퍼 클래스
-    - SentenceTransformer 기반 모델 사용
+    - SentenceTransformer 기반 모델 사용 (config.INFERENCE_BACKEND에 따라 int8/ONNX 가능)
     - Dense 검색에서 질의어 임베딩에 사용됨
     """
 
     def __init__(self, model_name: str):
-        self.model = SentenceTransformer(model_name)
+        from model_runtime import get_query_encoder
+
+        self.model = get_query_encoder(model_name)
 
     def embed_query(self, text: str) -> List[float]:
-        return self.model.encode([text], show_progress_bar=False)[0].tolist()
+        return self.model.encode([text])[0].tolist()
 
 
 class DensePineconeRetriever(BaseRetriever):
     """
     Pinecone에서 Dense 벡터 기반 검색을 수행하는 LangChain 호환 Retriever
     - SBERT로 임베딩된 쿼리 벡터를 기반으로 검색
+    - 메타데이터 필터 / 최신성 조건은 Pinecone 질의의 filter로 인덱스 안에서 적용
     - 결과를 LangChain Document 형태로 반환
     """
 
@@ -37,58 +49,119 @@ class DensePineconeRetriever(BaseRetriever):
     embeddings: Any = None
     id_to_text: dict = {}
     top_k: int = 0
-
-    def __init__(self, index_name: str = DENSE_INDEX_NAME, top_k: int = TOP_K):
+    bitmap: Any = None
+    metadata_filter: Optional[dict] = None
+    recency_years: Optional[int] = None
+
+    def __init__(
+        self,
+        index_name: str = DENSE_INDEX_NAME,
+        top_k: int = TOP_K,
+        id_to_text_path: str = ID_TO_TEXT_PATH_DENSE,
+        id_to_meta_path: str = ID_TO_META_PATH_DENSE,
+        metadata_filter: Optional[dict] = None,
+        recency_years: Optional[int] = RECENCY_YEARS,
+        index: Any = None
+    ):
         super().__init__()
 
-        # Pinecone API 초기화
-        _api_key = os.getenv("PINECONE_API_KEY")
-        _env = os.getenv("PINECONE_ENV", os.getenv("PINECONE_REGION", "us-east-1-aws"))
-        if not _api_key:
-            raise ValueError("PINECONE_API_KEY 환경 변수가 설정되지 않았습니다.")
+        # Pinecone API 초기화 (index가 주어지면 그대로 사용, 예: 부하 테스트용 로컬 인덱스)
+        if index is not None:
+            self.index = index
+        else:
+            _api_key = os.getenv("PINECONE_API_KEY")
+            _env = os.getenv("PINECONE_ENV", os.getenv("PINECONE_REGION", "us-east-1-aws"))
+            if not _api_key:
+                raise ValueError("PINECONE_API_KEY 환경 변수가 설정되지 않았습니다.")
+
+            from pinecone import Pinecone as PineconeClient
 
-        pc = PineconeClient(api_key=_api_key, environment=_env)
-        self.index = pc.Index(index_name)
+            pc = PineconeClient(api_key=_api_key, environment=_env)
+            self.index = pc.Index(index_name)
 
-        # 임베딩 모델 및 파라미터 초기화
+        # 임베딩 모델 및 파라미터 초기화 (모델은 코퍼스 간 공유)
         self.embeddings = SBERTEmbeddings(DENSE_MODEL_NAME)
         self.top_k = top_k
 
         # ID → 텍스트 매핑 파일 불러오기 (없으면 빈 딕셔너리)
-        if os.path.exists(ID_TO_TEXT_PATH_DENSE):
-            with open(ID_TO_TEXT_PATH_DENSE, "r", encoding="utf-8") as f:
+        if os.path.exists(id_to_text_path):
+            with open(id_to_text_path, "r", encoding="utf-8") as f:
                 self.id_to_text = json.load(f)
         else:
             self.id_to_text = {}
-            print(f"[WARN] 매핑 파일을 찾을 수 없습니다: {ID_TO_TEXT_PATH_DENSE}")
+            print(f"[WARN] 매핑 파일을 찾을 수 없습니다: {id_to_text_path}")
+
+        # 필터 / 최신성 설정 (로컬 메타데이터 비트맵으로 질의 필터를 미리 결정)
+        self.bitmap = MetadataBitmapIndex(load_id_to_meta(id_to_meta_path))
+        self.metadata_filter = metadata_filter
+        self.recency_years = recency_years
 
     def get_relevant_documents(self, query: str) -> List[Document]:
         """
         질의어 → 벡터 변환 → Pinecone 유사도 검색 → Document 리스트로 반환
         """
-        q_vec = self.embeddings.embed_query(query)
-
-        results = self.index.query(
-            vector=q_vec,
-            top_k=self.top_k,
-            include_metadata=True
-        )
-
-        docs: List[Document] = []
-        for match in results.get("matches", []):
-            doc_id = match.get("id", "")
-            full_text = self.id_to_text.get(doc_id, "")
-            meta = match.get("metadata", {})
-            if full_text:
-                docs.append(Document(page_content=full_text, metadata=meta))
+        return self.search(query)
+
+    def search(
+        self,
+        query: str,
+        metadata_filter: Optional[dict] = None,
+        recency_years: Optional[int] = None
+    ) -> List[Document]:
+        """
+        필터/최신성 조건을 지정한 검색 (지정하지 않으면 Retriever 기본값 사용)
+        - 메타데이터 필터가 지정되면 후보 품질이 높아지므로 FILTERED_TOP_K개만 가져와 rerank 비용을 줄임
+          (최신성 조건만 있을 때는 TOP_K 유지)
+        """
+        user_filter = metadata_filter if metadata_filter is not None else self.metadata_filter
+        with stage("filter_build"):
+            query_filter = build_query_filter(
+                self.bitmap,
+                user_filter,
+                recency_years if recency_years is not None else self.recency_years,
+                min_matches=RECENCY_MIN_MATCHES,
+            )
+        top_k = min(self.top_k, FILTERED_TOP_K) if user_filter else self.top_k
+        with stage("dense.encode_query"):
+            q_vec = self.embeddings.embed_query(query)
+
+        with stage("pinecone.query", kind="network"):
+            results = self.index.query(
+                vector=q_vec,
+                top_k=top_k,
+                filter=query_filter,
+                include_metadata=True
+            )
+
+        with stage("doc_lookup"):
+            docs: List[Document] = []
+            for match in results.get("matches", []):
+                doc_id = match.get("id", "")
+                full_text = self.id_to_text.get(doc_id, "")
+                meta = match.get("metadata", {})
+                if full_text:
+                    docs.append(Document(page_content=full_text, metadata=meta))
         return docs
 
 
 def create_dense_retriever(
     index_name: str = DENSE_INDEX_NAME,
-    top_k: int = TOP_K
+    top_k: int = TOP_K,
+    id_to_text_path: str = ID_TO_TEXT_PATH_DENSE,
+    id_to_meta_path: str = ID_TO_META_PATH_DENSE,
+    metadata_filter: Optional[dict] = None,
+    recency_years: Optional[int] = RECENCY_YEARS,
+    index: Any = None
 ) -> DensePineconeRetriever:
     """
     외부 모듈에서 호출 가능한 Dense Retriever 생성 함수
     """
-    return DensePineconeRetriever(index_name=index_name, top_k=top_k)
+    return DensePineconeRetriever(
+        index_name=index_name,
+        top_k=top_k,
+        id_to_text_path=id_to_text_path,
+        id_to_meta_path=id_to_meta_path,
+        metadata_filter=metadata_filter,
+        recency_years=recency_years,
+        index=index,
+    )
@@ -4,25 +4,41 @@ import os
 # 상위 디렉토리에서 config, retriever 모듈들을 import할 수 있도록 경로 추가
 sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
 
+from typing import Optional
+
 from config import (
     USE_SPARSE,          # True면 Sparse (BM25), False면 Dense (SBERT) 사용
     TOP_K,               # 검색 결과 상위 K개 문서 반환
-    DENSE_INDEX_NAME,
-    SPARSE_INDEX_NAME,
 )
+from corpus import get_corpus
 
-from retriever.dense_retriever import DensePineconeRetriever
-from retriever.sparse_retriever import create_sparse_retriever
-
-def create_retriever():
+def create_retriever(corpus: Optional[str] = None):
     """
     설정에 따라 Dense 또는 Sparse Retriever 인스턴스를 생성하여 반환합니다.
     - config.USE_SPARSE = True → Sparse (BM25 기반)
     - config.USE_SPARSE = False → Dense (SBERT 기반)
+    - corpus: config.CORPORA에 등록된 코퍼스 이름 (없으면 기본 코퍼스), 코퍼스별 인덱스/청크 저장소로 라우팅
+    - 선택된 백엔드의 모듈만 import하여 사용하지 않는 의존성(sentence_transformers 등)은 로드하지 않음
     """
+    settings = get_corpus(corpus)
+
     if USE_SPARSE:
-        print("🔍 Sparse Retriever 사용 중 (BM25)")
-        return create_sparse_retriever()
+        from retriever.sparse_retriever import create_sparse_retriever
+
+        print(f"🔍 Sparse Retriever 사용 중 (BM25, 코퍼스: {settings['name']})")
+        return create_sparse_retriever(
+            index_name=settings["sparse_index_name"],
+            top_k=TOP_K,
+            id_to_text_path=settings["id_to_text_path_sparse"],
+            id_to_meta_path=settings["id_to_meta_path_sparse"],
+        )
     else:
-        print("🔍 Dense Retriever 사용 중 (SBERT)")
-        return DensePineconeRetriever(index_name=DENSE_INDEX_NAME, top_k=TOP_K)
+        from retriever.dense_retriever import DensePineconeRetriever
+
+        print(f"🔍 Dense Retriever 사용 중 (SBERT, 코퍼스: {settings['name']})")
+        return DensePineconeRetriever(
+            index_name=settings["dense_index_name"],
+            top_k=TOP_K,
+            id_to_text_path=settings["id_to_text_path_dense"],
+            id_to_meta_path=settings["id_to_meta_path_dense"],
+        )
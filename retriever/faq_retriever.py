@@ -0,0 +1,64 @@
+import os
+import json
+from typing import Any, Dict, Optional
+
+import numpy as np
+
+from config import FAQ_INDEX_PATH, FAQ_SCORE_THRESHOLD, FAQ_TIE_MARGIN
+
+
+class FAQMatcher:
+    """
+    사전 계산된 FAQ 질문 임베딩과 사용자 질의를 비교하는 빠른 응답 매처
+    - 유사도가 임계값 이상이면 큐레이션된 답변을 그대로 반환
+    - rerank 및 LLM 호출 없이 응답하므로 가장 저렴한 경로
+    - 점수 차이가 tie_margin 이내인 항목끼리는 최신 연도/기수 항목을 우선 (이전 기수의 답변이 그대로 나가지 않도록)
+    """
+
+    def __init__(
+        self,
+        index_path: str = FAQ_INDEX_PATH,
+        threshold: float = FAQ_SCORE_THRESHOLD,
+        tie_margin: float = FAQ_TIE_MARGIN
+    ):
+        from model_runtime import get_query_encoder
+
+        with open(index_path, "r", encoding="utf-8") as f:
+            faq_index = json.load(f)
+
+        self.entries = faq_index["entries"]
+        self.embeddings = np.asarray(faq_index["embeddings"], dtype=np.float32)
+        self.model = get_query_encoder(faq_index["model_name"])
+        self.threshold = threshold
+        self.tie_margin = tie_margin
+        # 연도/기수가 없는 항목(이전 형식의 인덱스 포함)은 가장 오래된 것으로 취급
+        self.recency = [(entry.get("year") or 0, entry.get("cohort") or 0) for entry in self.entries]
+
+    def match(self, query: str) -> Optional[Dict[str, Any]]:
+        """
+        질의와 가장 유사한 FAQ 항목을 찾아 임계값 이상이면 반환 (score 포함), 아니면 None
+        """
+        if not self.entries:
+            return None
+
+        q_vec = self.model.encode([query], normalize=True)[0]
+        scores = self.embeddings @ q_vec
+        best_score = float(scores.max())
+        if best_score < self.threshold:
+            return None
+        near = np.flatnonzero(scores >= max(best_score - self.tie_margin, self.threshold))
+        best = int(max(near, key=lambda i: (self.recency[i], scores[i])))
+        return {**self.entries[best], "score": float(scores[best])}
+
+
+def create_faq_matcher(
+    index_path: str = FAQ_INDEX_PATH,
+    threshold: float = FAQ_SCORE_THRESHOLD
+) -> Optional[FAQMatcher]:
+    """
+    FAQ 인덱스 파일이 있으면 FAQMatcher를 생성하고, 없으면 None 반환
+    """
+    if not os.path.exists(index_path):
+        print(f"[WARN] FAQ 인덱스를 찾을 수 없습니다: {index_path}")
+        return None
+    return FAQMatcher(index_path=index_path, threshold=threshold)
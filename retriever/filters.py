@@ -0,0 +1,171 @@
+import os
+import json
+from typing import Any, Dict, List, Optional
+
+import numpy as np
+
+# Pinecone 메타데이터 필터 비교 연산자 → numpy 연산
+_COMPARATORS = {
+    "$eq": lambda col, v: col == v,
+    "$ne": lambda col, v: col != v,
+    "$gt": lambda col, v: col > v,
+    "$gte": lambda col, v: col >= v,
+    "$lt": lambda col, v: col < v,
+    "$lte": lambda col, v: col <= v,
+}
+
+
+def load_id_to_meta(path: str) -> Dict[str, dict]:
+    """
+    ID → 메타데이터 매핑 파일 로드 (없으면 빈 딕셔너리, 필터는 인덱스 쪽에서만 적용됨)
+    """
+    if not os.path.exists(path):
+        print(f"[WARN] 메타데이터 매핑 파일을 찾을 수 없습니다: {path}")
+        return {}
+    with open(path, "r", encoding="utf-8") as f:
+        return json.load(f)
+
+
+def combine_filters(*filters: Optional[dict]) -> Optional[dict]:
+    """
+    여러 Pinecone 필터를 $and로 결합 (None은 무시)
+    """
+    active = [f for f in filters if f]
+    if not active:
+        return None
+    if len(active) == 1:
+        return active[0]
+    return {"$and": active}
+
+
+def recency_clause(min_year: int) -> dict:
+    """
+    min_year 이후 문서 + 연도 정보가 없는 문서(상시 안내 자료 등)를 남기는 필터
+    """
+    return {"$or": [{"year": {"$gte": min_year}}, {"has_year": False}]}
+
+
+def recency_weights(years: List[Optional[int]], window: int) -> List[float]:
+    """
+    문서 연도 목록 → 최신성 가중치 (0~1)
+    - 후보 중 최신 연도와 연도 없는 문서(상시 안내 자료 등)는 1, 1년 오래될수록 1/window씩 감소
+    """
+    dated = [y for y in years if y is not None]
+    if not dated or window <= 0:
+        return [1.0] * len(years)
+    latest = max(dated)
+    return [1.0 if y is None else max(0.0, 1.0 - (latest - y) / window) for y in years]
+
+
+class MetadataBitmapIndex:
+    """
+    로컬 ID → 메타데이터 매핑 위에서 Pinecone 필터 문법을 비트맵(불리언 배열)으로 평가하는 인덱스
+    - 필드별 값을 열 단위 배열로 보관하여 필터 평가가 문서 수에 대해 벡터화됨
+    - 원격 질의 전에 필터에 걸리는 문서 수를 로컬에서 계산해 최신성 기간을 결정하는 데 사용
+    - 로컬 검색(평가/부하 테스트용 인덱스)에서는 후보 마스크로 직접 사용
+    """
+
+    def __init__(self, id_to_meta: Dict[str, dict]):
+        self.ids: List[str] = list(id_to_meta.keys())
+        self._columns: Dict[str, np.ndarray] = {}
+        self._present: Dict[str, np.ndarray] = {}
+
+        fields = {key for meta in id_to_meta.values() for key in meta}
+        for field in fields:
+            values = [id_to_meta[doc_id].get(field) for doc_id in self.ids]
+            self._present[field] = np.array([v is not None for v in values], dtype=bool)
+            self._columns[field] = np.array(values, dtype=object)
+
+    def __len__(self) -> int:
+        return len(self.ids)
+
+    def _field_mask(self, field: str, condition: Any) -> np.ndarray:
+        if field not in self._columns:
+            return np.zeros(len(self.ids), dtype=bool)
+        column, present = self._columns[field], self._present[field]
+
+        if not isinstance(condition, dict):
+            condition = {"$eq": condition}
+
+        mask = present.copy()
+        for op, value in condition.items():
+            if op in _COMPARATORS:
+                result = np.zeros(len(self.ids), dtype=bool)
+                result[present] = _COMPARATORS[op](column[present], value).astype(bool)
+                mask &= result
+            elif op == "$in":
+                mask &= np.isin(column, list(value))
+            elif op == "$nin":
+                mask &= ~np.isin(column, list(value))
+            else:
+                raise ValueError(f"지원하지 않는 필터 연산자입니다: {op}")
+        return mask
+
+    def mask(self, metadata_filter: Optional[dict]) -> np.ndarray:
+        """
+        필터를 만족하는 문서 위치의 불리언 배열 반환 (필터가 없으면 전체 True)
+        """
+        if not metadata_filter:
+            return np.ones(len(self.ids), dtype=bool)
+
+        result = np.ones(len(self.ids), dtype=bool)
+        for key, condition in metadata_filter.items():
+            if key == "$and":
+                for sub in condition:
+                    result &= self.mask(sub)
+            elif key == "$or":
+                sub_mask = np.zeros(len(self.ids), dtype=bool)
+                for sub in condition:
+                    sub_mask |= self.mask(sub)
+                result &= sub_mask
+            else:
+                result &= self._field_mask(key, condition)
+        return result
+
+    def count(self, metadata_filter: Optional[dict]) -> int:
+        return int(self.mask(metadata_filter).sum())
+
+    def matching_ids(self, metadata_filter: Optional[dict]) -> List[str]:
+        return [doc_id for doc_id, keep in zip(self.ids, self.mask(metadata_filter)) if keep]
+
+    def _years(self) -> np.ndarray:
+        if "year" not in self._columns:
+            return np.array([], dtype=int)
+        return self._columns["year"][self._present["year"]].astype(int)
+
+    def latest_year(self) -> Optional[int]:
+        years = self._years()
+        return int(years.max()) if len(years) else None
+
+    def earliest_year(self) -> Optional[int]:
+        years = self._years()
+        return int(years.min()) if len(years) else None
+
+
+def build_query_filter(
+    bitmap: Optional[MetadataBitmapIndex],
+    metadata_filter: Optional[dict] = None,
+    recency_years: Optional[int] = None,
+    min_matches: int = 1,
+) -> Optional[dict]:
+    """
+    사용자 필터와 최신성 조건을 결합해 인덱스 질의에 넘길 Pinecone 필터를 생성
+    - 최신 연도는 로컬 메타데이터에서 계산하고, 최근 recency_years년 문서가 min_matches개 미만이면
+      원격 재질의 없이 로컬 비트맵으로 기간을 1년씩 넓혀 결정
+    - 로컬 메타데이터가 없으면 최신성 조건은 생략하고 사용자 필터만 적용
+    """
+    if not recency_years or bitmap is None or len(bitmap) == 0:
+        return combine_filters(metadata_filter)
+
+    latest = bitmap.latest_year()
+    if latest is None:
+        return combine_filters(metadata_filter)
+
+    earliest = bitmap.earliest_year()
+    min_year = latest - recency_years + 1
+    while min_year > earliest:
+        candidate = combine_filters(metadata_filter, recency_clause(min_year))
+        if bitmap.count(candidate) >= min_matches:
+            return candidate
+        min_year -= 1
+    return combine_filters(metadata_filter)
@@ -0,0 +1,156 @@
+import os
+import re
+import json
+import threading
+from collections import OrderedDict
+from functools import lru_cache
+from typing import Callable, List, Optional
+
+from config import SPARSE_TOKENIZER
+
+# 형태소 분석 결과 중 BM25 토큰으로 남길 품사 태그 (체언, 용언 어간, 어근, 외국어, 숫자, 한자)
+KIWI_KEEP_TAG_PREFIXES = ("NN", "NR", "NP", "VV", "VA", "XR", "SL", "SN", "SH")
+
+_WORD_PATTERN = re.compile(r"[가-힣]+|[a-zA-Z]+|[0-9]+")
+_HANGUL_PATTERN = re.compile(r"[가-힣]+")
+
+
+class KiwiTokenizer:
+    """
+    Kiwi 형태소 분석기 기반 한국어 토크나이저
+    - 조사(J*), 어미(E*), 문장부호 등을 제거하고 의미 있는 형태소만 남김
+    - "보아즈는", "보아즈의" 같은 교착형이 하나의 토큰("보아즈")으로 모여 어휘 크기와 재현율 개선
+    """
+
+    def __init__(self):
+        from kiwipiepy import Kiwi
+
+        self.kiwi = Kiwi()
+
+    def __call__(self, text: str) -> List[str]:
+        return [
+            token.form.lower()
+            for token in self.kiwi.tokenize(text)
+            if token.tag.startswith(KIWI_KEEP_TAG_PREFIXES)
+        ]
+
+
+class CharNgramTokenizer:
+    """
+    음절 n-gram 기반 한국어 토크나이저 (외부 의존성 없음)
+    - 한글 어절은 음절 n-gram으로 분해하여 조사가 붙어도 어간 n-gram이 일치하도록 함
+    - 영문/숫자는 소문자 단어 그대로 사용
+    """
+
+    def __init__(self, n: int = 2):
+        self.n = n
+
+    def __call__(self, text: str) -> List[str]:
+        tokens: List[str] = []
+        for word in _WORD_PATTERN.findall(text.lower()):
+            if _HANGUL_PATTERN.fullmatch(word) and len(word) > self.n:
+                tokens.extend(word[i:i + self.n] for i in range(len(word) - self.n + 1))
+            else:
+                tokens.append(word)
+        return tokens
+
+
+class CachedTokenizer:
+    """
+    토크나이저 결과를 LRU 방식으로 캐싱하는 래퍼
+    - BM25 fit()과 encode_documents()가 같은 문서를 두 번 토크나이즈하는 비용과
+      반복 질의의 형태소 분석 비용을 제거
+    """
+
+    def __init__(self, tokenizer: Callable[[str], List[str]], maxsize: int = 50000):
+        self.tokenizer = tokenizer
+        self.maxsize = maxsize
+        self._cache: "OrderedDict[str, List[str]]" = OrderedDict()
+        self._lock = threading.Lock()  # 여러 코퍼스/스레드가 같은 토크나이저를 공유
+
+    def __call__(self, text: str) -> List[str]:
+        with self._lock:
+            tokens = self._cache.get(text)
+            if tokens is not None:
+                self._cache.move_to_end(text)
+                return tokens
+
+        tokens = self.tokenizer(text)
+        with self._lock:
+            self._cache[text] = tokens
+            if len(self._cache) > self.maxsize:
+                self._cache.popitem(last=False)
+        return tokens
+
+
+@lru_cache(maxsize=None)
+def get_tokenizer(name: str = SPARSE_TOKENIZER) -> Optional[Callable[[str], List[str]]]:
+    """
+    이름에 해당하는 (캐싱된) BM25 토크나이저 반환
+    - 프로세스 내에서 이름별로 한 번만 생성되어 모든 코퍼스의 BM25 인코더가 공유
+    - "default"면 None (pinecone_text 기본 토크나이저 사용)
+    - "kiwi"는 kiwipiepy가 없으면 예외 발생 (다른 토크나이저로 대체하면 인덱스와 질의의 토큰 해시가 어긋남)
+    """
+    if name == "default":
+        return None
+    if name == "kiwi":
+        try:
+            return CachedTokenizer(KiwiTokenizer())
+        except ImportError as e:
+            raise ImportError(
+                "kiwi 토크나이저에는 kiwipiepy가 필요합니다 (pip install kiwipiepy)"
+            ) from e
+    if name == "char_ngram":
+        return CachedTokenizer(CharNgramTokenizer())
+    raise ValueError(f"지원하지 않는 토크나이저입니다: {name}")
+
+
+def tokenizer_record_path(id_to_text_path: str) -> str:
+    """
+    sparse 인덱스를 만든 토크나이저 이름을 기록하는 파일 경로 (ID → 텍스트 매핑 파일 옆)
+    """
+    return os.path.splitext(id_to_text_path)[0] + ".tokenizer.json"
+
+
+def save_tokenizer_name(id_to_text_path: str, tokenizer_name: str) -> None:
+    """
+    업로드에 사용한 토크나이저 이름을 기록 (검색 시 check_tokenizer_name으로 확인)
+    """
+    with open(tokenizer_record_path(id_to_text_path), "w", encoding="utf-8") as f:
+        json.dump({"tokenizer": tokenizer_name}, f, ensure_ascii=False)
+
+
+def check_tokenizer_name(id_to_text_path: str, tokenizer_name: str) -> None:
+    """
+    검색에 사용할 토크나이저가 sparse 인덱스를 만들 때와 같은지 확인
+    - 다르거나 기록이 없으면 질의 토큰 해시가 인덱스와 맞지 않아 검색이 조용히 실패하므로 예외 발생
+    """
+    path = tokenizer_record_path(id_to_text_path)
+    if not os.path.exists(path):
+        raise ValueError(
+            f"sparse 인덱스의 토크나이저 기록이 없습니다: {path} "
+            f"(python vectorstore/sparse_uploader.py 로 인덱스를 다시 업로드하세요)"
+        )
+    with open(path, "r", encoding="utf-8") as f:
+        indexed = json.load(f)["tokenizer"]
+    if indexed != tokenizer_name:
+        raise ValueError(
+            f"sparse 인덱스는 '{indexed}' 토크나이저로 만들어졌지만 검색 설정은 '{tokenizer_name}'입니다 "
+            f"(config.SPARSE_TOKENIZER를 맞추거나 인덱스를 다시 업로드하세요)"
+        )
+
+
+def create_bm25_encoder(texts: List[str], tokenizer_name: str = SPARSE_TOKENIZER):
+    """
+    지정한 토크나이저로 BM25Encoder를 생성하고 말뭉치에 fit하여 반환
+    - 업로드(sparse_uploader)와 검색(sparse_retriever)이 같은 함수를 사용해야 토큰 해시가 일치함
+    """
+    from pinecone_text.sparse import BM25Encoder
+
+    encoder = BM25Encoder()
+    tokenizer = get_tokenizer(tokenizer_name)
+    if tokenizer is not None:
+        # pinecone_text는 fit/encode 시 self._tokenizer(text)로 토큰을 얻음
+        encoder._tokenizer = tokenizer
+    encoder.fit(texts)
+    return encoder
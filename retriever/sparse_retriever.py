@@ -1,4 +1,4 @@
-from typing import Any, List
+from typing import Any, List, Optional
 from dotenv import load_dotenv
 from langchain.schema import Document
 from langchain_core.retrievers import BaseRetriever
@@ -6,10 +6,20 @@ from pydantic import BaseModel, Field
 
 import os
 import json
-from pinecone import Pinecone
-from pinecone_text.sparse import BM25Encoder
 
-from config import SPARSE_INDEX_NAME, TOP_K, ID_TO_TEXT_PATH_SPARSE
+from config import (
+    INFERENCE_MODE,
+    SPARSE_INDEX_NAME,
+    SPARSE_TOKENIZER,
+    TOP_K,
+    FILTERED_TOP_K,
+    RECENCY_YEARS,
+    RECENCY_MIN_MATCHES,
+    ID_TO_TEXT_PATH_SPARSE,
+    ID_TO_META_PATH_SPARSE,
+)
+from profiling import stage
+from retriever.filters import MetadataBitmapIndex, build_query_filter, load_id_to_meta
 
 # 환경 변수 로드 (.env에서 PINECONE_API_KEY, 환경명 등)
 load_dotenv()
@@ -20,6 +30,7 @@ class SparsePineconeRetriever(BaseRetriever, BaseModel):
     Pinecone Sparse 인덱스를 활용한 BM25 기반 LangChain 호환 Retriever
 
     - 질의를 Sparse 벡터로 인코딩하여 Pinecone에서 유사 문서 검색
+    - 메타데이터 필터 / 최신성 조건은 Pinecone 질의의 filter로 인덱스 안에서 적용
     - 반환된 결과를 LangChain Document 리스트로 변환
     """
 
@@ -28,26 +39,55 @@ class SparsePineconeRetriever(BaseRetriever, BaseModel):
     encoder: Any = Field(...)
     index: Any = Field(...)
     id_to_text: dict = Field(...)
+    bitmap: Any = Field(default=None)
+    metadata_filter: Optional[dict] = Field(default=None)
+    recency_years: Optional[int] = Field(default=RECENCY_YEARS)
 
     def get_relevant_documents(self, query: str) -> List[Document]:
         """
         질의를 BM25 Sparse 벡터로 인코딩하고 Pinecone에서 top-k 검색
         결과를 LangChain Document 형식으로 반환
         """
-        query_vec = self.encoder.encode_queries([query])[0]
-
-        results = self.index.query(
-            top_k=self.top_k,
-            sparse_vector=query_vec,
-            include_metadata=True
-        )
-
-        docs = []
-        for match in results.get("matches", []):
-            doc_id = match["id"]
-            text = self.id_to_text.get(doc_id, "")
-            metadata = match.get("metadata", {})
-            docs.append(Document(page_content=text, metadata=metadata))
+        return self.search(query)
+
+    def search(
+        self,
+        query: str,
+        metadata_filter: Optional[dict] = None,
+        recency_years: Optional[int] = None
+    ) -> List[Document]:
+        """
+        필터/최신성 조건을 지정한 검색 (지정하지 않으면 Retriever 기본값 사용)
+        - 메타데이터 필터가 지정되면 후보 품질이 높아지므로 FILTERED_TOP_K개만 가져와 rerank 비용을 줄임
+          (최신성 조건만 있을 때는 TOP_K 유지)
+        """
+        user_filter = metadata_filter if metadata_filter is not None else self.metadata_filter
+        with stage("filter_build"):
+            query_filter = build_query_filter(
+                self.bitmap,
+                user_filter,
+                recency_years if recency_years is not None else self.recency_years,
+                min_matches=RECENCY_MIN_MATCHES,
+            )
+        top_k = min(self.top_k, FILTERED_TOP_K) if user_filter else self.top_k
+        with stage("bm25.encode_query"):
+            query_vec = self.encoder.encode_queries([query])[0]
+
+        with stage("pinecone.query", kind="network"):
+            results = self.index.query(
+                top_k=top_k,
+                sparse_vector=query_vec,
+                filter=query_filter,
+                include_metadata=True
+            )
+
+        with stage("doc_lookup"):
+            docs = []
+            for match in results.get("matches", []):
+                doc_id = match["id"]
+                text = self.id_to_text.get(doc_id, "")
+                metadata = match.get("metadata", {})
+                docs.append(Document(page_content=text, metadata=metadata))
 
         return docs
 
@@ -57,31 +97,57 @@ class SparsePineconeRetriever(BaseRetriever, BaseModel):
 
 def create_sparse_retriever(
     index_name: str = SPARSE_INDEX_NAME,
-    top_k: int = TOP_K
+    top_k: int = TOP_K,
+    tokenizer_name: str = SPARSE_TOKENIZER,
+    id_to_text_path: str = ID_TO_TEXT_PATH_SPARSE,
+    id_to_meta_path: str = ID_TO_META_PATH_SPARSE,
+    metadata_filter: Optional[dict] = None,
+    recency_years: Optional[int] = RECENCY_YEARS,
+    index: Any = None
 ) -> SparsePineconeRetriever:
     """
     SparsePineconeRetriever 인스턴스를 생성하는 헬퍼 함수
 
-    1. 로컬에서 ID → 텍스트 매핑 로드
-    2. 전체 텍스트에 대해 BM25Encoder 학습
-    3. Pinecone 인덱스에 연결 후 Retriever 반환
+    1. 로컬에서 ID → 텍스트 / 메타데이터 매핑 로드 (메타데이터는 필터 비트맵으로 변환)
+    2. 전체 텍스트에 대해 BM25Encoder 학습 (업로드 시와 같은 한국어 토크나이저 사용)
+       - INFERENCE_MODE="sidecar"면 학습/질의 인코딩을 추론 사이드카에 맡김 (워커는 토크나이저를 로드하지 않음)
+    3. Pinecone 인덱스에 연결 후 Retriever 반환 (index가 주어지면 연결 생략, 예: 부하 테스트용 로컬 인덱스)
     """
-    with open(ID_TO_TEXT_PATH_SPARSE, "r", encoding="utf-8") as f:
+    from retriever.korean_tokenizer import check_tokenizer_name
+
+    # 업로드 시와 다른 토크나이저면 토큰 해시가 맞지 않으므로 시작 시점에 중단
+    check_tokenizer_name(id_to_text_path, tokenizer_name)
+
+    with open(id_to_text_path, "r", encoding="utf-8") as f:
         id_to_text = json.load(f)
     texts = list(id_to_text.values())
+    bitmap = MetadataBitmapIndex(load_id_to_meta(id_to_meta_path))
+
+    if INFERENCE_MODE == "sidecar":
+        from inference_sidecar import RemoteBM25Encoder
+
+        encoder = RemoteBM25Encoder(id_to_text_path, tokenizer_name=tokenizer_name)
+    else:
+        from retriever.korean_tokenizer import create_bm25_encoder
+
+        # 🔥 반드시 fit()을 호출하여 말뭉치 기반 인코딩 학습
+        encoder = create_bm25_encoder(texts, tokenizer_name=tokenizer_name)
 
-    encoder = BM25Encoder()
-    encoder.fit(texts)  # 🔥 반드시 fit()을 호출하여 말뭉치 기반 인코딩 학습
+    if index is None:
+        from pinecone import Pinecone
 
-    api_key = os.getenv("PINECONE_API_KEY")
-    env = os.getenv("PINECONE_ENV", os.getenv("PINECONE_REGION", "us-east-1-aws"))
-    pc = Pinecone(api_key=api_key, environment=env)
-    index = pc.Index(index_name)
+        api_key = os.getenv("PINECONE_API_KEY")
+        env = os.getenv("PINECONE_ENV", os.getenv("PINECONE_REGION", "us-east-1-aws"))
+        pc = Pinecone(api_key=api_key, environment=env)
+        index = pc.Index(index_name)
 
     return SparsePineconeRetriever(
         index_name=index_name,
         top_k=top_k,
         encoder=encoder,
         index=index,
-        id_to_text=id_to_text
+        id_to_text=id_to_text,
+        bitmap=bitmap,
+        metadata_filter=metadata_filter,
+        recency_years=recency_years
     )
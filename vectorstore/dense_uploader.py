@@ -1,11 +1,16 @@
+import sys
 import os
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
 import json
+import argparse
 from typing import List, Tuple, Optional
 from dotenv import load_dotenv
 from pinecone import Pinecone, ServerlessSpec
-from config import DENSE_INDEX_NAME, DENSE_MODEL_NAME, ID_TO_TEXT_PATH
+from config import DEFAULT_CORPUS, DENSE_MODEL_NAME, USE_EMBEDDING_CACHE
+from corpus import get_corpus
 from preprocess import load_documents
-from sentence_transformers import SentenceTransformer
+from vectorstore.embedding_cache import EmbeddingCache, embed_with_cache
 from langchain.schema import Document
 
 # .env 파일에서 Pinecone API 키 및 환경 설정 로드
@@ -15,10 +20,20 @@ class SBERTEmbeddings:
     """
     SBERT 임베딩 모델 래퍼 클래스
     - 문서 전체 또는 단일 쿼리를 임베딩하여 벡터 반환
+    - 모델은 첫 인코딩 시점에 로드 (임베딩 캐시가 모두 적중하면 로드하지 않음)
     """
 
     def __init__(self, model_name: str):
-        self.model = SentenceTransformer(model_name)
+        self.model_name = model_name
+        self._model = None
+
+    @property
+    def model(self):
+        if self._model is None:
+            from sentence_transformers import SentenceTransformer
+
+            self._model = SentenceTransformer(self.model_name)
+        return self._model
 
     def embed_documents(self, texts: List[str]) -> List[List[float]]:
         """
@@ -36,34 +51,45 @@ class SBERTEmbeddings:
 
 
 def create_and_upload_vectorstore(
-    index_name: str = DENSE_INDEX_NAME,
+    corpus: str = DEFAULT_CORPUS,
     model_name: str = DENSE_MODEL_NAME
 ) -> None:
     """
     Dense 벡터 인덱스를 Pinecone에 생성하고 문서를 업로드하는 파이프라인
+    - corpus: config.CORPORA에 등록된 코퍼스 (코퍼스별 원본 폴더 / 인덱스 / 매핑 파일 사용)
 
     1. 문서 로딩 및 청킹
-    2. SBERT 임베딩 수행
-    3. 인덱스 존재 여부 확인 및 필요 시 생성
-    4. id → 원문 매핑 저장
-    5. 벡터 및 메타데이터 업로드 (batch 단위)
+    2. id → 원문 / 메타데이터 매핑 저장
+    3. SBERT 임베딩 수행 (디스크 임베딩 캐시에 없는 청크만 인코딩)
+    4. 인덱스 존재 여부 확인 및 필요 시 생성
+    5. 벡터 및 메타데이터(연도/기수/문서 유형 포함, 필터 검색용) 업로드 (batch 단위)
     """
 
+    settings = get_corpus(corpus)
+    index_name = settings["dense_index_name"]
+    id_to_text_path = settings["id_to_text_path_dense"]
+
     # 1. 문서 불러오기
-    all_docs: List[Document] = load_documents()
+    all_docs: List[Document] = load_documents(settings["data_path"])
     if not all_docs:
-        print("❌ 문서가 없습니다. 'data' 디렉토리를 확인하세요.")
+        print(f"❌ 문서가 없습니다. '{settings['data_path']}' 디렉토리를 확인하세요.")
         return
 
-    # 2. ID → 텍스트 매핑 저장 (JSON)
+    # 2. ID → 텍스트 / 메타데이터 매핑 저장 (JSON, 메타데이터는 검색 시 로컬 필터 계산에 사용)
     id_to_text: dict = {str(i): doc.page_content for i, doc in enumerate(all_docs)}
-    os.makedirs(os.path.dirname(ID_TO_TEXT_PATH), exist_ok=True)
-    with open(ID_TO_TEXT_PATH, "w", encoding="utf-8") as f:
+    id_to_meta: dict = {str(i): doc.metadata for i, doc in enumerate(all_docs)}
+    os.makedirs(os.path.dirname(id_to_text_path), exist_ok=True)
+    with open(id_to_text_path, "w", encoding="utf-8") as f:
         json.dump(id_to_text, f, ensure_ascii=False, indent=2)
-    print(f"✅ 로컬 매핑 파일 생성 완료: '{ID_TO_TEXT_PATH}' (총 {len(all_docs)}개 문서)")
+    with open(settings["id_to_meta_path_dense"], "w", encoding="utf-8") as f:
+        json.dump(id_to_meta, f, ensure_ascii=False)
+    print(f"✅ 로컬 매핑 파일 생성 완료: '{id_to_text_path}' (총 {len(all_docs)}개 문서)")
 
-    # 3. SBERT 모델 초기화
+    # 3. SBERT 임베딩 (캐시 적중분은 재인코딩하지 않음)
     embeddings = SBERTEmbeddings(model_name)
+    texts = [doc.page_content for doc in all_docs]
+    cache = EmbeddingCache() if USE_EMBEDDING_CACHE else None
+    vectors = embed_with_cache(texts, model_name, embeddings.embed_documents, cache)
 
     # 4. Pinecone 연결 및 인덱스 준비
     api_key = os.getenv("PINECONE_API_KEY")
@@ -81,8 +107,7 @@ def create_and_upload_vectorstore(
 
     if index_name not in existing:
         print(f"➕ 인덱스 '{index_name}' 생성 중...")
-        sample_text = all_docs[0].page_content[:100]
-        dim = len(embeddings.embed_query(sample_text))
+        dim = len(vectors[0])
         spec = ServerlessSpec(cloud=cloud, region=region)
         pc.create_index(name=index_name, dimension=dim, metric="cosine", spec=spec)
     else:
@@ -91,10 +116,8 @@ def create_and_upload_vectorstore(
     index = pc.Index(index_name)
 
     # 5. 벡터 및 메타데이터 업로드
-    texts = [doc.page_content for doc in all_docs]
     metadatas = [doc.metadata for doc in all_docs]
     ids = [str(i) for i in range(len(all_docs))]
-    vectors = embeddings.embed_documents(texts)
 
     batch_size = 100
     total = len(ids)
@@ -113,4 +136,7 @@ def create_and_upload_vectorstore(
 
 if __name__ == "__main__":
     # 단독 실행 시 벡터 업로드 수행
-    create_and_upload_vectorstore()
+    parser = argparse.ArgumentParser(description="Dense 인덱스 업로드")
+    parser.add_argument("--corpus", default=DEFAULT_CORPUS, help="업로드할 코퍼스 이름 (config.CORPORA)")
+    args = parser.parse_args()
+    create_and_upload_vectorstore(corpus=args.corpus)
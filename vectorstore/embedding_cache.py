@@ -0,0 +1,152 @@
+import os
+import time
+import sqlite3
+import hashlib
+import threading
+from typing import Callable, Dict, List, Optional, Sequence
+
+import numpy as np
+
+from config import EMBEDDING_CACHE_MAX_MB, EMBEDDING_CACHE_PATH
+
+# SQLite IN (...) 절 하나에 넣을 최대 파라미터 수
+_SQL_BATCH = 500
+# 용량 초과 시 이 비율까지 줄여 매 삽입마다 eviction이 반복되지 않도록 함
+_EVICT_TARGET_RATIO = 0.9
+
+
+def text_hash(text: str) -> str:
+    return hashlib.sha256(text.encode("utf-8")).hexdigest()
+
+
+class EmbeddingCache:
+    """
+    (모델명, 텍스트 해시) → 임베딩 벡터를 저장하는 디스크 영구 캐시 (SQLite)
+    - 변경되지 않은 청크는 재인코딩 없이 재사용하여 인덱스 재생성 시 모델 연산을 생략
+    - 전체 크기가 max_bytes를 넘으면 가장 오래 사용되지 않은 항목부터 삭제 (LRU)
+    """
+
+    def __init__(self, path: str = EMBEDDING_CACHE_PATH, max_bytes: int = EMBEDDING_CACHE_MAX_MB * 1024 * 1024):
+        self.path = path
+        self.max_bytes = max_bytes
+        self._lock = threading.Lock()
+
+        if os.path.dirname(path):
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+        self.conn = sqlite3.connect(path, check_same_thread=False)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute(
+            """
+            CREATE TABLE IF NOT EXISTS embeddings (
+                model TEXT NOT NULL,
+                text_hash TEXT NOT NULL,
+                dim INTEGER NOT NULL,
+                vector BLOB NOT NULL,
+                size INTEGER NOT NULL,
+                last_access REAL NOT NULL,
+                PRIMARY KEY (model, text_hash)
+            )
+            """
+        )
+        self.conn.execute("CREATE INDEX IF NOT EXISTS idx_last_access ON embeddings (last_access)")
+        self.conn.commit()
+
+    def get_many(self, model: str, hashes: Sequence[str]) -> Dict[str, np.ndarray]:
+        """
+        캐시에 있는 해시의 벡터를 반환하고 접근 시각을 갱신
+        """
+        found: Dict[str, np.ndarray] = {}
+        unique = list(dict.fromkeys(hashes))
+        with self._lock:
+            for start in range(0, len(unique), _SQL_BATCH):
+                batch = unique[start:start + _SQL_BATCH]
+                placeholders = ",".join("?" * len(batch))
+                rows = self.conn.execute(
+                    f"SELECT text_hash, vector FROM embeddings WHERE model = ? AND text_hash IN ({placeholders})",
+                    [model, *batch],
+                ).fetchall()
+                for h, blob in rows:
+                    found[h] = np.frombuffer(blob, dtype=np.float32)
+
+            if found:
+                now = time.time()
+                self.conn.executemany(
+                    "UPDATE embeddings SET last_access = ? WHERE model = ? AND text_hash = ?",
+                    [(now, model, h) for h in found],
+                )
+                self.conn.commit()
+        return found
+
+    def put_many(self, model: str, hashes: Sequence[str], vectors: np.ndarray) -> None:
+        """
+        새로 계산한 벡터를 저장하고 용량 초과 시 LRU eviction 수행
+        """
+        vectors = np.asarray(vectors, dtype=np.float32)
+        now = time.time()
+        rows = [
+            (model, h, int(vec.shape[0]), vec.tobytes(), int(vec.nbytes), now)
+            for h, vec in zip(hashes, vectors)
+        ]
+        with self._lock:
+            self.conn.executemany(
+                "INSERT OR REPLACE INTO embeddings (model, text_hash, dim, vector, size, last_access) "
+                "VALUES (?, ?, ?, ?, ?, ?)",
+                rows,
+            )
+            self.conn.commit()
+            self._evict()
+
+    def total_bytes(self) -> int:
+        return int(self.conn.execute("SELECT COALESCE(SUM(size), 0) FROM embeddings").fetchone()[0])
+
+    def _evict(self) -> None:
+        total = self.total_bytes()
+        if total <= self.max_bytes:
+            return
+
+        to_free = total - int(self.max_bytes * _EVICT_TARGET_RATIO)
+        victims, freed = [], 0
+        for model, h, size in self.conn.execute(
+            "SELECT model, text_hash, size FROM embeddings ORDER BY last_access ASC"
+        ):
+            victims.append((model, h))
+            freed += size
+            if freed >= to_free:
+                break
+        self.conn.executemany("DELETE FROM embeddings WHERE model = ? AND text_hash = ?", victims)
+        self.conn.commit()
+        print(f"🧹 임베딩 캐시 정리: {len(victims)}개 항목 삭제 ({freed / 1024 / 1024:.1f}MB)")
+
+    def close(self) -> None:
+        self.conn.close()
+
+
+def embed_with_cache(
+    texts: List[str],
+    model_name: str,
+    encode_fn: Callable[[List[str]], Sequence[Sequence[float]]],
+    cache: Optional[EmbeddingCache] = None,
+) -> List[List[float]]:
+    """
+    캐시에 없는 텍스트만 encode_fn으로 인코딩하고, 결과를 캐시에 채워 전체 벡터를 입력 순서대로 반환
+    - 같은 텍스트가 여러 번 나오면 한 번만 인코딩
+    """
+    if cache is None:
+        return [list(map(float, vec)) for vec in encode_fn(texts)]
+
+    hashes = [text_hash(t) for t in texts]
+    cached = cache.get_many(model_name, hashes)
+
+    missing: Dict[str, str] = {}
+    for h, t in zip(hashes, texts):
+        if h not in cached and h not in missing:
+            missing[h] = t
+    print(f"💾 임베딩 캐시: {len(texts) - sum(1 for h in hashes if h in missing)}/{len(texts)}개 적중, "
+          f"{len(missing)}개 새로 인코딩")
+
+    if missing:
+        new_vectors = np.asarray(encode_fn(list(missing.values())), dtype=np.float32)
+        cache.put_many(model_name, list(missing.keys()), new_vectors)
+        cached.update(zip(missing.keys(), new_vectors))
+
+    return [cached[h].tolist() for h in hashes]
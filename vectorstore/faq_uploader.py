@@ -0,0 +1,67 @@
+import sys
+import os
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+import json
+import argparse
+from typing import Any, Dict, List
+
+import numpy as np
+
+from config import DEFAULT_CORPUS, DENSE_MODEL_NAME, USE_EMBEDDING_CACHE
+from corpus import get_corpus
+from preprocess import load_faq_pairs
+from vectorstore.dense_uploader import SBERTEmbeddings
+from vectorstore.embedding_cache import EmbeddingCache, embed_with_cache
+
+
+def create_faq_index(
+    corpus: str = DEFAULT_CORPUS,
+    model_name: str = DENSE_MODEL_NAME
+) -> None:
+    """
+    CSV의 질문/답변 쌍으로 FAQ 빠른 응답용 로컬 인덱스를 생성하는 파이프라인
+    - corpus: config.CORPORA에 등록된 코퍼스 (코퍼스별 원본 폴더 / FAQ 인덱스 경로 사용)
+
+    1. CSV에서 FAQ 질문/답변 쌍 추출
+    2. 질문만 SBERT로 임베딩 (디스크 임베딩 캐시 사용, 정규화하여 내적 = 코사인 유사도)
+    3. 항목 + 임베딩을 JSON 파일로 저장
+    """
+
+    settings = get_corpus(corpus)
+    index_path = settings["faq_index_path"]
+
+    # 1. FAQ 쌍 추출
+    pairs: List[Dict[str, Any]] = load_faq_pairs(settings["data_path"])
+    if not pairs:
+        print("❌ FAQ 쌍이 없습니다. 질문/답변 컬럼을 가진 CSV를 확인하세요.")
+        return
+
+    # 2. 질문 임베딩 (캐시에는 정규화 전 벡터가 저장되므로 dense 업로드와 캐시를 공유)
+    questions = [pair["question"] for pair in pairs]
+    cache = EmbeddingCache() if USE_EMBEDDING_CACHE else None
+    vectors = np.asarray(
+        embed_with_cache(questions, model_name, SBERTEmbeddings(model_name).embed_documents, cache),
+        dtype=np.float32,
+    )
+    vectors /= np.clip(np.linalg.norm(vectors, axis=1, keepdims=True), 1e-12, None)
+
+    # 3. 인덱스 저장
+    faq_index = {
+        "model_name": model_name,
+        "entries": pairs,
+        "embeddings": vectors.tolist(),
+    }
+    os.makedirs(os.path.dirname(index_path), exist_ok=True)
+    with open(index_path, "w", encoding="utf-8") as f:
+        json.dump(faq_index, f, ensure_ascii=False)
+
+    print(f"✅ FAQ 인덱스 생성 완료: '{index_path}' (총 {len(pairs)}개 질문)")
+
+
+if __name__ == "__main__":
+    # 단독 실행 시 FAQ 인덱스 생성
+    parser = argparse.ArgumentParser(description="FAQ 빠른 응답 인덱스 생성")
+    parser.add_argument("--corpus", default=DEFAULT_CORPUS, help="대상 코퍼스 이름 (config.CORPORA)")
+    args = parser.parse_args()
+    create_faq_index(corpus=args.corpus)
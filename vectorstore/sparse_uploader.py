@@ -3,47 +3,56 @@ import os
 sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
 
 import json
+import argparse
 from typing import List
 from dotenv import load_dotenv
 from pinecone import Pinecone
-from pinecone_text.sparse import BM25Encoder
 from langchain.schema import Document
 
-from config import SPARSE_INDEX_NAME, ID_TO_TEXT_PATH_SPARSE
+from config import DEFAULT_CORPUS, SPARSE_TOKENIZER
+from corpus import get_corpus
 from preprocess import load_documents
+from retriever.korean_tokenizer import create_bm25_encoder, save_tokenizer_name
 
 # 환경 변수 로드 (.env 파일에서 API 키, 환경명 등)
 load_dotenv()
 
-def create_and_upload_sparse_index():
+def create_and_upload_sparse_index(corpus: str = DEFAULT_CORPUS):
     """
     문서 청킹 + BM25 Sparse 인코딩 → Pinecone 업로드 파이프라인
+    - corpus: config.CORPORA에 등록된 코퍼스 (코퍼스별 원본 폴더 / 인덱스 / 매핑 파일 사용)
 
     1. 문서 로딩 및 청킹
-    2. ID → 텍스트 매핑 저장
+    2. ID → 텍스트 / 메타데이터 매핑 저장
     3. BM25 벡터 인코딩
     4. Pinecone 인덱스 확인 및 연결
-    5. 벡터 + 메타데이터 업로드
+    5. 벡터 + 메타데이터(연도/기수/문서 유형 포함, 필터 검색용) 업로드
     """
 
+    settings = get_corpus(corpus)
+    index_name = settings["sparse_index_name"]
+    id_to_text_path = settings["id_to_text_path_sparse"]
+
     # 1. 문서 로딩
-    all_docs: List[Document] = load_documents()
+    all_docs: List[Document] = load_documents(settings["data_path"])
     if not all_docs:
-        print("❌ 문서가 없습니다. 'data' 디렉토리를 확인하세요.")
+        print(f"❌ 문서가 없습니다. '{settings['data_path']}' 디렉토리를 확인하세요.")
         return
     print(f"✅ 문서 로딩 완료: 총 {len(all_docs)}개 문서 생성됨.")
 
-    # 2. ID → 텍스트 매핑 저장 (JSON)
+    # 2. ID → 텍스트 / 메타데이터 매핑 저장 (JSON)
     texts = [doc.page_content for doc in all_docs]
     id_to_text = {str(i): text for i, text in enumerate(texts)}
-    os.makedirs(os.path.dirname(ID_TO_TEXT_PATH_SPARSE), exist_ok=True)
-    with open(ID_TO_TEXT_PATH_SPARSE, "w", encoding="utf-8") as f:
+    id_to_meta = {str(i): doc.metadata for i, doc in enumerate(all_docs)}
+    os.makedirs(os.path.dirname(id_to_text_path), exist_ok=True)
+    with open(id_to_text_path, "w", encoding="utf-8") as f:
         json.dump(id_to_text, f, ensure_ascii=False, indent=2)
-    print(f"✅ 로컬 매핑 저장 완료: {ID_TO_TEXT_PATH_SPARSE}")
+    with open(settings["id_to_meta_path_sparse"], "w", encoding="utf-8") as f:
+        json.dump(id_to_meta, f, ensure_ascii=False)  # 검색 시 로컬 필터 계산용
+    print(f"✅ 로컬 매핑 저장 완료: {id_to_text_path}")
 
-    # 3. BM25 Sparse 인코딩
-    encoder = BM25Encoder()
-    encoder.fit(texts)  # 전체 말뭉치 기준으로 단어 빈도 계산
+    # 3. BM25 Sparse 인코딩 (한국어 토크나이저, 검색 시와 동일 설정)
+    encoder = create_bm25_encoder(texts, tokenizer_name=SPARSE_TOKENIZER)  # 전체 말뭉치 기준으로 단어 빈도 계산
     sparse_vectors = encoder.encode_documents(texts)
 
     # 4. Pinecone 연결 및 인덱스 확인
@@ -57,12 +66,12 @@ def create_and_upload_sparse_index():
     region = "-".join(parts[:-1])
 
     pc = Pinecone(api_key=api_key)
-    if SPARSE_INDEX_NAME not in pc.list_indexes().names():
-        raise ValueError(f"❌ 인덱스 '{SPARSE_INDEX_NAME}'가 존재하지 않습니다.")
+    if index_name not in pc.list_indexes().names():
+        raise ValueError(f"❌ 인덱스 '{index_name}'가 존재하지 않습니다.")
     else:
-        print(f"✅ 인덱스 '{SPARSE_INDEX_NAME}' 존재함")
+        print(f"✅ 인덱스 '{index_name}' 존재함")
 
-    index = pc.Index(SPARSE_INDEX_NAME)
+    index = pc.Index(index_name)
 
     # 5. Sparse 벡터 및 메타데이터 업로드 (100개씩 배치)
     batch_size = 100
@@ -85,9 +94,14 @@ def create_and_upload_sparse_index():
         index.upsert(vectors=upserts)
         print(f"▶️ Upsert 완료: {ids[0]} ~ {ids[-1]}")
 
-    print(f"모든 sparse vector 업로드 완료! 총 {total}개 문서")
+    # 6. 인덱스를 만든 토크나이저 기록 (검색 시 같은 토크나이저인지 확인)
+    save_tokenizer_name(id_to_text_path, SPARSE_TOKENIZER)
+    print(f"모든 sparse vector 업로드 완료! 총 {total}개 문서 (토크나이저: {SPARSE_TOKENIZER})")
 
 
 if __name__ == "__main__":
     # 단독 실행 시 sparse 인덱스 생성 및 업로드 실행
-    create_and_upload_sparse_index()
+    parser = argparse.ArgumentParser(description="Sparse(BM25) 인덱스 업로드")
+    parser.add_argument("--corpus", default=DEFAULT_CORPUS, help="업로드할 코퍼스 이름 (config.CORPORA)")
+    args = parser.parse_args()
+    create_and_upload_sparse_index(corpus=args.corpus)